@@ -0,0 +1,49 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import sdot_api
+from update_db import (
+    api_key,
+    filter_parks_data, preprocess_park_data, save_to_park_db,
+    filter_mainstreet_data, preprocess_mainstreet_data, save_to_mainstreet_db
+)
+
+# 여러 날짜 누락분 백필: 피드를 한 번만 훑으며 날짜가 완성될 때마다 저장
+def backfill(api_key: str, start_date: str, end_date: str, park: bool = True, mainstreet: bool = True) -> int:
+    client = sdot_api.SdotClient(api_key)
+    total = 0
+    for day, df_day in client.iter_range_days(start_date, end_date):
+        started = time.perf_counter()
+
+        if park:
+            df_park_raw = filter_parks_data(df_day)
+            if not df_park_raw.empty:
+                save_to_park_db(preprocess_park_data(df_park_raw))
+
+        if mainstreet:
+            df_main_raw = filter_mainstreet_data(df_day)
+            if not df_main_raw.empty:
+                save_to_mainstreet_db(preprocess_mainstreet_data(df_main_raw))
+
+        total += len(df_day)
+        print(f"[BACKFILL] {day} → {len(df_day)}건 처리 ({time.perf_counter() - started:.1f}s)")
+    return total
+
+
+# 실행
+if __name__ == '__main__':
+    yesterday = (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    parser = argparse.ArgumentParser(description="S-DoT 누락 기간 백필")
+    parser.add_argument('start_date', help="시작일 (YYYY-MM-DD)")
+    parser.add_argument('end_date', nargs='?', default=yesterday, help="종료일 (YYYY-MM-DD, 기본: 어제)")
+    parser.add_argument('--only', choices=['park', 'main_street'], help="한쪽 테이블만 백필")
+    args = parser.parse_args()
+
+    total = backfill(
+        api_key, args.start_date, args.end_date,
+        park=args.only in (None, 'park'),
+        mainstreet=args.only in (None, 'main_street')
+    )
+    print(f"✅ 백필 완료! {args.start_date} ~ {args.end_date}, 총 {total}건")
@@ -0,0 +1,52 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import forecast_engine
+import model_store
+import predictor
+
+# 장소별 model.predict (fast 모드) vs forecast_engine.predict_batch (한 번에 행렬 계산)
+# 저장된 모델을 --places 개 장소로 돌려 써서 장소 수에 따른 시간과 yhat 차이 비교
+# 실행: python -m benchmarks.bench_batch_forecast --places 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs='+', default=["models_mainstreet/샤로수길", "models_mainstreet/이태원회나무길"])
+    parser.add_argument("--places", type=int, default=100)
+    args = parser.parse_args()
+
+    loaded = [model_store.load_model(place_dir) for place_dir in args.models]
+    today = max(model.history_dates.max() for model in loaded).normalize()
+    start_date = (today + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+    end_date = (today + pd.Timedelta(days=7)).strftime('%Y-%m-%d')
+    models = {f"place_{i}": loaded[i % len(loaded)] for i in range(args.places)}
+
+    started = time.perf_counter()
+    expected = {name: predictor.forecast(model, start_date, end_date, fast=True) for name, model in models.items()}
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    bounds = predictor.stored_bounds(start_date, end_date)
+    horizons = {name: predictor.horizon_ds(model, bounds) for name, model in models.items()}
+    horizon_time = time.perf_counter() - started
+    started = time.perf_counter()
+    batched = forecast_engine.predict_batch(models, horizons)
+    batch_time = time.perf_counter() - started
+
+    diff = max(np.abs(expected[name]['yhat'].to_numpy() - batched[name]['yhat'].clip(lower=0).to_numpy()).max()
+               for name in models)
+    scale = max(expected[name]['yhat'].abs().max() for name in models)
+    same_grid = all((expected[name]['ds'].to_numpy() == batched[name]['ds'].to_numpy()).all() for name in models)
+    rows = sum(len(result) for result in batched.values())
+    print(f"{args.places}곳, {rows}행")
+    print(f"model.predict 반복: {loop_time:.2f}s, batch: {batch_time * 1000:.1f}ms (+ 예측 시각 {horizon_time * 1000:.1f}ms), "
+          f"x{loop_time / batch_time:.0f}")
+    print(f"시각 일치 {same_grid}, yhat 최대 차이 {diff:.2e} (최대 yhat 대비 {diff / scale:.2e})")
+
+
+if __name__ == "__main__":
+    main()
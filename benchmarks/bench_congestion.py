@@ -0,0 +1,148 @@
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import calculate_congestion
+from calculate_congestion import place_settings
+
+# 혼잡도: 행 단위 반복 (이전 process_place_congestion) vs 배열 계산 (calculate_congestion.compute_congestion)
+# place_settings 의 모든 장소에 가짜 예측값(0 포함)을 만들어 라벨/체류 인구/1인당 면적 일치 여부와 시간 비교
+# 실행: python -m benchmarks.bench_congestion --days 7 --repeat 20
+# 차이가 허용 범위를 넘으면 AssertionError 로 실패
+
+# 상대 차이 허용치: 누적 합 순서 차이로 생기는 부동소수 오차 수준
+REL_TOLERANCE = 1e-9
+
+
+# 이전 구현의 라벨 함수와 반복문
+def get_park_congestion_label(visitors, area_m2):
+    if visitors == 0:
+        return "여유"
+    per_capita_area = area_m2 / visitors
+    if per_capita_area >= 100:
+        return "여유"
+    elif per_capita_area >= 50:
+        return "보통"
+    elif per_capita_area >= 20:
+        return "약간 혼잡"
+    else:
+        return "혼잡"
+
+
+def get_street_congestion_label(visitors, area_m2):
+    if visitors == 0:
+        return "여유"
+    per_capita_area = area_m2 / visitors
+    if per_capita_area >= 9.29:
+        return "여유"
+    elif per_capita_area >= 4.61:
+        return "보통"
+    elif per_capita_area >= 2.81:
+        return "약간 혼잡"
+    else:
+        return "혼잡"
+
+
+def loop_congestion(name, df):
+    settings = place_settings[name]
+    place_type, area_m2 = settings["type"], settings["area_m2"]
+    stay_hours, scaling_factor = settings["stay_hours"], settings["scaling_factor"]
+    stay_history = []
+    stay_population = 0
+    rows = []
+    for _, row in df.iterrows():
+        incoming = row['yhat'] * scaling_factor
+        stay_history.append(incoming)
+        stay_population += incoming
+        if len(stay_history) > stay_hours:
+            stay_population -= stay_history[-(stay_hours+1)]
+        stay_population = max(stay_population, 0)
+        if place_type == "park":
+            label = get_park_congestion_label(stay_population, area_m2)
+        else:
+            label = get_street_congestion_label(stay_population, area_m2)
+        per_capita_area = area_m2 / stay_population if stay_population > 0 else area_m2
+        rows.append((name, row['forecast_date'], int(row['forecast_hour']), label, per_capita_area, stay_population))
+    return rows
+
+
+def fake_forecast(days: int, rng) -> pd.DataFrame:
+    frames = []
+    start = date(2025, 6, 1)
+    for name, settings in place_settings.items():
+        hours = days * 24
+        # 단계 경계 근처 값이 나오도록 면적 기준으로 규모를 잡고 일부는 0
+        scale = settings["area_m2"] / settings["scaling_factor"] / settings["stay_hours"] / (30 if settings["type"] == "park" else 4)
+        yhat = np.round(rng.gamma(2.0, scale / 2, hours), 2)
+        yhat[rng.random(hours) < 0.1] = 0
+        frames.append(pd.DataFrame({
+            'name': name,
+            'forecast_date': [start + timedelta(days=h // 24) for h in range(hours)],
+            'forecast_hour': [h % 24 for h in range(hours)],
+            'yhat': yhat,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    labels_checked, mismatches, residues, drifts, max_rel = 0, 0, 0, 0, 0.0
+    loop_time = batch_time = 0.0
+    for _ in range(args.repeat):
+        forecast = fake_forecast(args.days, rng)
+
+        started = time.perf_counter()
+        expected = [row for name, df in forecast.groupby('name', sort=True) for row in loop_congestion(name, df)]
+        loop_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = calculate_congestion.compute_congestion(forecast)
+        batch_time += time.perf_counter() - started
+
+        expected = pd.DataFrame(expected, columns=['name', 'congestion_date', 'congestion_hour', 'congestion_level',
+                                                   'per_capita_area', 'stay_population'])
+        assert (expected['name'].to_numpy() == result['name'].to_numpy()).all()
+        assert (expected['congestion_hour'].to_numpy() == result['congestion_hour'].to_numpy()).all()
+        labels_checked += len(result)
+        mismatch = expected['congestion_level'].to_numpy() != result['congestion_level'].to_numpy()
+        mismatches += int(mismatch.sum())
+        # 창 안 유입이 모두 0 인데 이전 반복문의 더하고 빼기로 남은 1e-12 수준 잔여값 (1인당 면적이 1e16 으로 저장되던 행)
+        residue = (result['stay_population'].to_numpy() == 0) & (expected['stay_population'].to_numpy(dtype=float) > 0)
+        residues += int(residue.sum())
+        # 두 구현의 1인당 면적이 모두 단계 경계의 허용치 안에 있어 부동소수 오차로 라벨이 갈린 행
+        drift = np.zeros(len(result), dtype=bool)
+        for place_type, thresholds in calculate_congestion.CONGESTION_THRESHOLDS.items():
+            mask = np.array([place_settings[name]["type"] == place_type for name in result['name']])
+            for col in (expected, result):
+                area = col['per_capita_area'].to_numpy(dtype=float)[:, None]
+                near = (np.abs(area - thresholds) <= REL_TOLERANCE * thresholds).any(axis=1)
+                drift |= mask & near
+        drifts += int((mismatch & drift & ~residue).sum())
+        unexplained = mismatch & ~residue & ~drift
+        assert not unexplained.any(), (
+            f"라벨 불일치 {int(unexplained.sum())}건:\n"
+            f"{pd.concat([expected[unexplained], result[unexplained].add_prefix('new_')], axis=1).head(10)}"
+        )
+        for col in ('per_capita_area', 'stay_population'):
+            a, b = expected[col].to_numpy(dtype=float)[~residue], result[col].to_numpy(dtype=float)[~residue]
+            max_rel = max(max_rel, float((np.abs(a - b) / np.maximum(np.abs(a), 1e-9)).max()))
+        assert max_rel < REL_TOLERANCE, f"체류 인구/1인당 면적 상대 차이 {max_rel:.2e} ≥ {REL_TOLERANCE:.0e}"
+
+    print(f"{len(place_settings)}곳 × {args.days * 24}시간 × {args.repeat}회 = {labels_checked}행")
+    print(f"반복문: {loop_time:.2f}s, 배열: {batch_time:.3f}s (x{loop_time / batch_time:.0f})")
+    print(f"라벨 불일치 {mismatches}건 (모두 단계 경계의 부동소수 오차 {drifts}건 또는 잔여값 행), "
+          f"체류 인구/1인당 면적 최대 상대 차이 {max_rel:.2e} "
+          f"(이전 반복문 잔여값으로 체류 인구가 0 이 아니던 {residues}행 제외)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import dedupe
+
+# 중복 제거: 기존(read_csv + drop_duplicates) vs dedupe 모듈(메모리 해시 집합 / 디스크 버킷)
+# 실행: python -m benchmarks.bench_dedupe --rows 2000000
+
+
+# 메인거리 CSV 와 같은 스키마, dup_ratio 비율만큼 앞쪽 행을 다시 섞어 넣음
+def synthetic_csv(path: str, n: int, dup_ratio: float = 0.1, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    base = n - int(n * dup_ratio)
+    stamps = pd.date_range("2025-04-01", periods=base // 100 + 1, freq="15min").strftime("%Y-%m-%d %H:%M:%S")
+    df = pd.DataFrame({
+        '시리얼': rng.integers(4000, 4100, base),
+        '측정시간': np.asarray(stamps)[rng.integers(0, len(stamps), base)],
+        '지역': 'main_street',
+        '행정동': rng.choice(['Itaewon1-dong', 'Nakseongdae-dong', 'Seogyo-dong'], base),
+        '방문자수': rng.integers(0, 500, base),
+        '구': rng.choice(['용산구', '관악구', '마포구'], base),
+    })
+    dups = df.iloc[rng.integers(0, base, n - base)]
+    df = pd.concat([df, dups]).iloc[rng.permutation(n)]
+    df.to_csv(path, index=False)
+
+
+def legacy_dedupe(src: str, dst: str, keys: list) -> int:
+    df = pd.read_csv(src)
+    df_dedup = df.drop_duplicates(subset=keys)
+    df_dedup.to_csv(dst, index=False)
+    return len(df) - len(df_dedup)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--spill-mb", type=float, default=1, help="디스크 버킷 경로를 강제로 타도록 하는 작은 메모리 한도")
+    args = parser.parse_args()
+
+    keys = dedupe.SCHEMA_KEYS['main_street']
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src.csv")
+        synthetic_csv(src, args.rows)
+        expected = os.path.join(tmp, "legacy.csv")
+
+        t0 = time.perf_counter()
+        removed = legacy_dedupe(src, expected, keys)
+        print(f"{'legacy drop_duplicates':<24} {removed:>9}건 제거  {time.perf_counter() - t0:7.2f}s")
+        expected_df = pd.read_csv(expected)
+
+        for label, limit in [("streaming in-memory", 1024), ("streaming spill", args.spill_mb)]:
+            dst = os.path.join(tmp, "out.csv")
+            stats = dedupe.dedupe_csv(src, dst, keys, max_memory_mb=limit)
+            pd.testing.assert_frame_equal(pd.read_csv(dst), expected_df)
+            assert stats['duplicates'] == removed
+            print(f"{label:<24} {stats['duplicates']:>9}건 제거  {stats['seconds']:7.2f}s  결과 동일 (spilled={stats['spilled']})")
+
+
+if __name__ == "__main__":
+    main()
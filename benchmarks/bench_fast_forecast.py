@@ -0,0 +1,47 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import model_store
+import predictor
+
+# 예측: 이력 전체 + 불확실성 샘플링 (이전 방식) vs 저장 구간만 샘플링 없이 (predictor.forecast fast)
+# 저장 구간은 모델의 마지막 이력 다음 날부터 7일 (predictor.main 과 같은 날짜 필터)
+# 실행: python -m benchmarks.bench_fast_forecast --models models_mainstreet/샤로수길 models_mainstreet/이태원회나무길
+
+
+def persisted(result: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    result = result[['ds', 'yhat']].copy()
+    dates = result['ds'].dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul').dt.strftime('%Y-%m-%d')
+    return result[(dates >= start_date) & (dates <= end_date)].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs='+', default=["models_mainstreet/샤로수길", "models_mainstreet/이태원회나무길"])
+    args = parser.parse_args()
+
+    for place_dir in args.models:
+        fitted = model_store.load_model(place_dir)
+        today = fitted.history_dates.max().normalize()
+        start_date = (today + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        end_date = (today + pd.Timedelta(days=7)).strftime('%Y-%m-%d')
+
+        started = time.perf_counter()
+        full = persisted(predictor.forecast(fitted, start_date, end_date, fast=False), start_date, end_date)
+        full_time = time.perf_counter() - started
+        started = time.perf_counter()
+        fast = persisted(predictor.forecast(fitted, start_date, end_date, fast=True), start_date, end_date)
+        fast_time = time.perf_counter() - started
+
+        same_grid = len(full) == len(fast) and (full['ds'].to_numpy() == fast['ds'].to_numpy()).all()
+        diff = np.abs(full['yhat'].to_numpy() - fast['yhat'].to_numpy()).max() if same_grid else float('nan')
+        print(f"{place_dir}: 이력 {len(fitted.history)}행, 저장 {len(fast)}행")
+        print(f"  전체: {full_time:.2f}s, fast: {fast_time:.3f}s (x{full_time / fast_time:.0f}), "
+              f"시각 일치 {same_grid}, yhat 최대 차이 {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
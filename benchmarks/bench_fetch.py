@@ -0,0 +1,82 @@
+import argparse
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+import pandas as pd
+import requests
+
+import sdot_api
+from benchmarks.feed import StandInServer, make_feed
+
+# 순차 수집(기존) vs 병렬·풀링 수집 비교
+# 실행: python -m benchmarks.bench_fetch --days 3 --latency 0.05
+
+
+# 기존 fetch_today_all_data (100건 페이지, 세션 없음)
+def legacy_fetch(base_url: str, api_key: str, target_date: str) -> pd.DataFrame:
+    all_data = []
+    for page in range(1, 1000):
+        url = f"{base_url}/{api_key}/xml/IotVdata018/{(page-1)*100+1}/{page*100}"
+        response = requests.get(url)
+        root = ET.fromstring(response.content)
+        rows = root.findall(".//row")
+        if not rows:
+            break
+        for row in rows:
+            sensing_time_str = row.find("SENSING_TIME").text
+            if not sensing_time_str.startswith(target_date):
+                if sensing_time_str < target_date:
+                    break
+                continue
+            all_data.append({
+                "MODEL_NM": row.findtext("MODEL_NM", default=None),
+                "SERIAL_NO": row.findtext("SERIAL_NO", default=None),
+                "SENSING_TIME": sensing_time_str,
+                "REGION": row.find("REGION").text,
+                "AUTONOMOUS_DISTRICT": row.find("AUTONOMOUS_DISTRICT").text,
+                "ADMINISTRATIVE_DISTRICT": row.find("ADMINISTRATIVE_DISTRICT").text,
+                "VISITOR_COUNT": int(row.find("VISITOR_COUNT").text),
+                "REG_DTTM": row.find("REG_DTTM").text
+            })
+        if rows[-1].find("SENSING_TIME").text < target_date:
+            break
+    return pd.DataFrame(all_data)
+
+
+def run(label: str, server: StandInServer, fn):
+    before = server.requests
+    t0 = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - t0
+    pages = server.requests - before
+    print(f"{label:<10} {len(df):>8}행  {pages:>5}요청  {elapsed:7.2f}s  {pages / elapsed:7.1f} pages/s")
+    return df, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--sensors", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=sdot_api.DEFAULT_WORKERS)
+    parser.add_argument("--ages", type=int, nargs="+", default=[1, 2, 4], help="며칠 전 데이터를 수집할지")
+    args = parser.parse_args()
+
+    end = datetime(2025, 5, 8, 23, 45)
+    rows = make_feed(end, args.days, sensors=args.sensors)
+    print(f"피드 {len(rows)}행, 지연 {args.latency * 1000:.0f}ms/요청")
+
+    with StandInServer(rows, latency=args.latency) as server:
+        client = sdot_api.SdotClient("KEY", base_url=server.base_url, workers=args.workers, cache=False)
+        for age in args.ages:
+            target_date = (end - timedelta(days=age)).strftime("%Y-%m-%d")
+            print(f"-- 대상일 {target_date} ({age}일 전)")
+            df_old, t_old = run("legacy", server, lambda: legacy_fetch(server.base_url, "KEY", target_date))
+            df_new, t_new = run("pooled", server, lambda: client.fetch_date_data(target_date))
+            pd.testing.assert_frame_equal(df_old, df_new)
+            print(f"결과 동일, 속도 향상 x{t_old / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import model
+
+# 공휴일/주말 가중치: 행 단위 apply (이전 방식) vs 달력 배열 (model.holiday_weekend_weights)
+# 장소 수 × 180일 × 시간당 행 수 만큼의 가짜 측정값으로 시간/결과 비교
+# 실행: python -m benchmarks.bench_holiday_weights --places 7 --rows-per-hour 6
+
+
+# 이전 구현 (행마다 .date() / .weekday() 와 set 조회)
+def apply_holiday_weekend_weight(row, holiday_dates):
+    current_day = row['ds'].date()
+    if current_day in holiday_dates:
+        return row['y'] * 3.0
+    elif row['ds'].weekday() in [5, 6]:
+        return row['y'] * 1.5
+    else:
+        return row['y']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--holidays", default="dataset/kr_holidays_2023_2025.csv")
+    parser.add_argument("--places", type=int, default=7)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--rows-per-hour", type=int, default=6)
+    args = parser.parse_args()
+
+    _, holiday_days = model.load_holidays(args.holidays)
+    holiday_dates = set(pd.to_datetime(holiday_days).date)
+    rng = np.random.default_rng(0)
+    end = pd.Timestamp('2025-06-30 23:00')
+    ds = pd.date_range(end=end, periods=args.days * 24 * args.rows_per_hour, freq=f"{60 // args.rows_per_hour}min")
+    frames = [pd.DataFrame({'ds': ds, 'y': rng.integers(0, 500, len(ds)).astype(float)}) for _ in range(args.places)]
+
+    started = time.perf_counter()
+    old = [df.apply(apply_holiday_weekend_weight, axis=1, holiday_dates=holiday_dates) for df in frames]
+    old_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    new = [model.prepare_training_frame(df, holiday_days, 'park')['y'] for df in frames]
+    new_time = time.perf_counter() - started
+
+    rows = sum(len(df) for df in frames)
+    diff = max(np.abs(a.to_numpy() - b.to_numpy()).max() for a, b in zip(old, new))
+    print(f"{args.places}곳 × {len(ds)}행 = {rows}행")
+    print(f"apply: {old_time:.3f}s, 배열: {new_time:.4f}s (x{old_time / max(new_time, 1e-9):.0f}), 최대 차이 {diff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import model_store
+
+# 이전 형식 pickle vs 모델 아티팩트: 크기, 불러오기 시간, 예측 일치 여부, LATEST 교체/되돌리기
+# 실행: python -m benchmarks.bench_model_store --models models_mainstreet/샤로수길.pkl models_mainstreet/이태원회나무길.pkl
+
+
+def timed(load, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        load()
+    return (time.perf_counter() - started) / repeat
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs='+', default=["models_mainstreet/샤로수길.pkl", "models_mainstreet/이태원회나무길.pkl"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--periods", type=int, default=9 * 24)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        for path in args.models:
+            name = os.path.splitext(os.path.basename(path))[0]
+            place_dir = os.path.join(tmp, name)
+            shutil.copy(path, model_store.legacy_path(place_dir))
+            first = model_store.import_legacy(place_dir)
+
+            def load_pickle():
+                with open(path, 'rb') as f:
+                    return pickle.load(f)
+
+            pkl_size = os.path.getsize(path)
+            artifact_size = dir_size(os.path.join(place_dir, first))
+            pkl_time = timed(load_pickle, args.repeat)
+            artifact_time = timed(lambda: model_store.load_artifact(place_dir), args.repeat)
+            print(f"{name}: pickle {pkl_size / 1024:.0f}KB / {pkl_time * 1000:.1f}ms, "
+                  f"아티팩트 {artifact_size / 1024:.1f}KB / {artifact_time * 1000:.1f}ms (x{pkl_size / artifact_size:.0f} 작음)")
+
+            # 예측 구간(마지막 이력 이후) yhat 비교
+            forecasts = []
+            for fitted in (load_pickle(), model_store.load_artifact(place_dir)):
+                future = fitted.make_future_dataframe(periods=args.periods, freq='h').tail(args.periods)
+                forecasts.append(fitted.predict(future)[['ds', 'yhat']])
+            same_grid = (forecasts[0]['ds'].to_numpy() == forecasts[1]['ds'].to_numpy()).all()
+            diff = np.abs(forecasts[0]['yhat'].to_numpy() - forecasts[1]['yhat'].to_numpy()).max()
+            print(f"  예측 {args.periods}시간: 시각 일치 {same_grid}, yhat 최대 차이 {diff:.2e}")
+
+            # 새 버전 저장 후 되돌리기
+            second = model_store.save_artifact(place_dir, model_store.load_artifact(place_dir),
+                                               model_store.read_manifest(place_dir))
+            rolled = model_store.rollback(place_dir)
+            print(f"  LATEST {second} → rollback → {rolled} ({'OK' if rolled == first else 'FAIL'})")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import gc
+import glob
+import gzip
+import os
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import pandas as pd
+
+import sdot_api
+from benchmarks.feed import make_feed, render_page
+
+# 페이지 파싱: ElementTree + 행 dict(기존) vs 열 버퍼(ColumnBuffer)
+# columnar = 일반 페이지용 정규식 토큰 경로, iterparse = 형식을 벗어난 페이지용 ElementTree 스트리밍 경로
+# 실행: python -m benchmarks.bench_parse [--pages-dir 저장된_페이지_폴더]
+
+
+# 기존 방식: 행마다 find() 후 dict 생성, 마지막에 DataFrame 변환
+def legacy_parse(pages: list) -> pd.DataFrame:
+    all_data = []
+    for content in pages:
+        root = ET.fromstring(content)
+        for row in root.findall(".//row"):
+            all_data.append({
+                "MODEL_NM": row.findtext("MODEL_NM", default=None),
+                "SERIAL_NO": row.findtext("SERIAL_NO", default=None),
+                "SENSING_TIME": row.find("SENSING_TIME").text,
+                "REGION": row.find("REGION").text,
+                "AUTONOMOUS_DISTRICT": row.find("AUTONOMOUS_DISTRICT").text,
+                "ADMINISTRATIVE_DISTRICT": row.find("ADMINISTRATIVE_DISTRICT").text,
+                "VISITOR_COUNT": int(row.find("VISITOR_COUNT").text),
+                "REG_DTTM": row.find("REG_DTTM").text
+            })
+    return pd.DataFrame(all_data)
+
+
+def columnar_parse(pages: list, scan: bool = True) -> pd.DataFrame:
+    buffer = sdot_api.ColumnBuffer(scan=scan)
+    for content in pages:
+        buffer.add_page(content)
+    return buffer.to_frame()
+
+
+def iterparse_parse(pages: list) -> pd.DataFrame:
+    return columnar_parse(pages, scan=False)
+
+
+def load_pages(pages_dir: str) -> list:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "**", "*.xml*"), recursive=True)):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def measure(label: str, fn, pages: list, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        df = fn(pages)
+        best = min(best, time.perf_counter() - t0)
+        del df
+
+    gc.collect()
+    tracemalloc.start()
+    df = fn(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = len(df)
+    print(f"{label:<10} {rows:>8}행  {best:6.3f}s  {rows / best:>10,.0f} rows/s  peak {peak / 2**20:7.1f} MiB")
+    return df, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages-dir", help="저장된 원본 XML 페이지 폴더 (*.xml, *.xml.gz)")
+    parser.add_argument("--days", type=int, default=4)
+    parser.add_argument("--sensors", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pages_dir:
+        pages = load_pages(args.pages_dir)
+    else:
+        rows = make_feed(datetime(2025, 5, 8, 23, 45), args.days, sensors=args.sensors)
+        pages = [render_page(rows[i:i + sdot_api.MAX_WINDOW], len(rows))
+                 for i in range(0, len(rows), sdot_api.MAX_WINDOW)]
+        del rows
+    print(f"페이지 {len(pages)}장, {sum(map(len, pages)) / 2**20:.1f} MiB")
+
+    df_old, t_old, m_old = measure("legacy", legacy_parse, pages, args.repeat)
+    df_tree, t_tree, m_tree = measure("iterparse", iterparse_parse, pages, args.repeat)
+    df_new, t_new, m_new = measure("columnar", columnar_parse, pages, args.repeat)
+    pd.testing.assert_frame_equal(df_old, df_tree)
+    pd.testing.assert_frame_equal(df_old, df_new)
+    print(f"결과 동일, 시간 x{t_old / t_new:.2f} (iterparse 경로 x{t_old / t_tree:.2f}), "
+          f"최대 메모리 x{m_old / m_new:.1f} 감소 (iterparse 경로 x{m_old / m_tree:.1f})")
+
+
+if __name__ == "__main__":
+    main()
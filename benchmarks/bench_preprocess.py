@@ -0,0 +1,110 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import preprocess
+from benchmarks.feed import DISTRICTS, SENSORS
+
+# 전처리: 기존(행 단위 apply, object 컬럼) vs preprocess 모듈(조인 + 범주형)
+# 실행: python -m benchmarks.bench_preprocess --rows 1000000
+
+
+def legacy_preprocess_park(df_park: pd.DataFrame) -> pd.DataFrame:
+    park_name_map = preprocess.PARK_NAME_MAP
+    df_park = df_park.copy()
+    df_park.rename(columns={
+        'SENSING_TIME': '측정시간',
+        'AUTONOMOUS_DISTRICT': '자치구',
+        'ADMINISTRATIVE_DISTRICT': '행정동',
+        'VISITOR_COUNT': '방문자수',
+        'REG_DTTM': '등록일'
+    }, inplace=True)
+    df_park.drop(columns='등록일', inplace=True)
+    df_park['측정시간'] = df_park['측정시간'].str.replace('_', ' ', regex=False)
+    df_park['구'] = df_park['자치구'].map(preprocess.DISTRICT_MAP)
+    df_park['datetime'] = pd.to_datetime(df_park['측정시간'])
+    df_park['공원명'] = df_park.apply(lambda x: park_name_map.get((x['구'], x['행정동']), '기타공원'), axis=1)
+    df_park = df_park[['측정시간', '행정동', '방문자수', '구', '공원명']]
+    return df_park.sort_values('측정시간').reset_index(drop=True)
+
+
+def legacy_preprocess_mainstreet(df_main: pd.DataFrame) -> pd.DataFrame:
+    df_main = df_main.rename(columns={
+        'MODEL_NM': '모델명',
+        'SERIAL_NO': '시리얼번호',
+        'SENSING_TIME': '측정시간',
+        'REGION': '지역',
+        'AUTONOMOUS_DISTRICT': '자치구',
+        'ADMINISTRATIVE_DISTRICT': '행정동',
+        'VISITOR_COUNT': '방문자수',
+        'REG_DTTM': '등록일'
+    })
+    df_main = df_main.drop(columns='등록일')
+    df_main = df_main[df_main['시리얼번호'].notna()]
+    df_main['시리얼번호'] = df_main['시리얼번호'].astype(int).astype(str)
+    df_main['측정시간'] = df_main['측정시간'].str.replace('_', ' ', regex=False)
+    df_main['구'] = df_main['자치구'].map(preprocess.DISTRICT_MAP)
+    df_main = df_main[['시리얼번호', '측정시간', '행정동', '방문자수', '구']]
+    return df_main.sort_values('측정시간').reset_index(drop=True)
+
+
+# fetch_today_all_data 결과와 같은 스키마의 합성 피드
+def synthetic_feed(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sensors = list(SENSORS) + [
+        ("parks" if i % 3 == 0 else "main_street", DISTRICTS[i % len(DISTRICTS)], f"Dong{i}-dong", str(5000 + i))
+        for i in range(len(SENSORS), 200)
+    ]
+    pick = rng.integers(0, len(sensors), n)
+    stamps = pd.date_range("2025-01-01", periods=n // 50 + 1, freq="15min").strftime("%Y-%m-%d_%H:%M:%S")
+    sensing = np.asarray(stamps, dtype=object)[np.sort(rng.integers(0, len(stamps), n))[::-1]]
+    table = np.array(sensors, dtype=object)
+    return pd.DataFrame({
+        "MODEL_NM": "DOTS-V",
+        "SERIAL_NO": table[pick, 3],
+        "SENSING_TIME": sensing,
+        "REGION": table[pick, 0],
+        "AUTONOMOUS_DISTRICT": table[pick, 1],
+        "ADMINISTRATIVE_DISTRICT": table[pick, 2],
+        "VISITOR_COUNT": rng.integers(0, 400, n),
+        "REG_DTTM": sensing,
+    })
+
+
+def measure(label: str, fn, df: pd.DataFrame):
+    t0 = time.perf_counter()
+    out = fn(df)
+    elapsed = time.perf_counter() - t0
+    mem = out.memory_usage(deep=True).sum()
+    print(f"{label:<22} {len(out):>9}행  {elapsed:7.2f}s  {len(out) / elapsed:>12,.0f} rows/s  {mem / 2**20:8.1f} MiB")
+    return out, elapsed, mem
+
+
+def assert_same(old: pd.DataFrame, new: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(old, new.astype({col: old[col].dtype for col in old}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df_all = synthetic_feed(args.rows)
+    df_park_raw = df_all[df_all["REGION"] != "main_street"]
+    df_main_raw = df_all[df_all["REGION"] == "main_street"]
+
+    old, t_old, m_old = measure("legacy park", legacy_preprocess_park, df_park_raw)
+    new, t_new, m_new = measure("vectorized park", preprocess.preprocess_park_data, df_park_raw)
+    assert_same(old, new)
+    print(f"공원: 결과 동일, 처리량 x{t_old / t_new:.1f}, 메모리 x{m_old / m_new:.1f} 감소")
+
+    old, t_old, m_old = measure("legacy mainstreet", legacy_preprocess_mainstreet, df_main_raw)
+    new, t_new, m_new = measure("vectorized mainstreet", preprocess.preprocess_mainstreet_data, df_main_raw)
+    assert_same(old, new)
+    print(f"메인거리: 결과 동일, 처리량 x{t_old / t_new:.1f}, 메모리 x{m_old / m_new:.1f} 감소")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import model
+import model_store
+
+# 재학습: cold start vs 전날 모델 warm start (반복 수, 시간, 예측 차이)
+# 저장된 모델의 history 를 시간별 평균으로 묶어 하루씩 밀린 두 학습 창을 만듦
+# 실행: python -m benchmarks.bench_warm_start --model models_mainstreet/샤로수길.pkl
+
+
+def hourly_history(model_path: str) -> pd.DataFrame:
+    with open(model_path, 'rb') as f:
+        history = pickle.load(f).history[['ds', 'y']]
+    hourly = history.groupby(history['ds'].dt.floor('h'))['y'].mean().reset_index()
+    return hourly
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="models_mainstreet/샤로수길.pkl")
+    parser.add_argument("--holidays", default="dataset/kr_holidays_2023_2025.csv")
+    parser.add_argument("--shift-days", type=int, default=1)
+    args = parser.parse_args()
+
+    holidays, _ = model.load_holidays(args.holidays)
+    hourly = hourly_history(args.model)
+    end = hourly['ds'].max()
+    shift = pd.Timedelta(days=args.shift_days)
+    yesterday = hourly[hourly['ds'] <= end - shift].reset_index(drop=True)
+    today = hourly[hourly['ds'] >= hourly['ds'].min() + shift].reset_index(drop=True)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        cold_path = os.path.join(tmp, "cold")
+        warm_path = os.path.join(tmp, "warm")
+        # 전날 모델 (두 경로 모두 같은 이전 모델에서 시작)
+        model.fit_and_save(model.FitJob('BENCH', 'yesterday', yesterday, warm_path), holidays, 3600, warm_start=False)
+        shutil.copytree(warm_path, cold_path)
+        shutil.copy(model.fit_stats_path(warm_path), model.fit_stats_path(cold_path))
+
+        cold = model.fit_and_save(model.FitJob('BENCH', 'cold', today, cold_path), holidays, 3600, warm_start=False)
+        warm = model.fit_and_save(model.FitJob('BENCH', 'warm', today, warm_path), holidays, 3600, warm_start=True)
+        print(f"cold: {model.describe_fit(cold)}")
+        print(f"warm: {model.describe_fit(warm)}")
+        print(f"warm vs 오늘 cold: {cold['last']['iterations'] - warm['last']['iterations']} iter, "
+              f"{cold['last']['seconds'] - warm['last']['seconds']:.1f}s 절약")
+
+        forecasts = []
+        for path in (cold_path, warm_path):
+            fitted = model_store.load_model(path)
+            future = fitted.make_future_dataframe(periods=9 * 24, freq='h')
+            forecasts.append(fitted.predict(future)['yhat'].to_numpy())
+        diff = np.abs(forecasts[0] - forecasts[1])
+        scale = np.abs(today['y']).max()
+        print(f"yhat 차이: 최대 {diff.max():.4f} (y 최대값 대비 {diff.max() / scale:.2e}), 평균 {diff.mean():.4f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
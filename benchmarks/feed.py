@@ -0,0 +1,122 @@
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+# 벤치마크용 IotVdata018 합성 피드 + 로컬 대역 서버
+
+SENSORS = [
+    # (REGION, 자치구, 행정동, 시리얼)
+    ("parks", "Seongdong-gu", "Seongsu1ga1-dong", None),
+    ("parks", "Seongdong-gu", "Seongsu1ga1(il)-dong", None),
+    ("parks", "Gangbuk-gu", "Beon3-dong", None),
+    ("parks", "Eunpyeong-gu", "Nokbeon-dong", None),
+    ("parks", "Gangdong-gu", "Amsa3-dong", None),
+    ("parks", "Songpa-gu", "Jamsil6-dong", None),
+    ("parks", "Seoul_Grand_Park", "Makgye-dong", None),
+    ("public_facilities", "Seodaemun-gu", "Cheonyeon-dong", None),
+    ("public_facilities", "Jung-gu", "Sogong-dong", None),
+    ("main_street", "Gwanak-gu", "Cheongnyong-dong", "4035"),
+    ("main_street", "Yongsan-gu", "Itaewon2(i)-dong", "4020"),
+    ("main_street", "Mapo-gu", "Mangwon1-dong", "4032"),
+]
+DISTRICTS = ["Jongno-gu", "Jung-gu", "Mapo-gu", "Gangnam-gu", "Songpa-gu", "Nowon-gu", "Guro-gu"]
+
+
+# 최신순 합성 레코드 (sensors 개 센서 × interval_min 간격)
+def make_feed(end: datetime, days: int, sensors: int = 120, interval_min: int = 15, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    sensor_list = list(SENSORS)
+    for i in range(len(sensor_list), sensors):
+        sensor_list.append(("main_street" if i % 3 else "parks", rng.choice(DISTRICTS), f"Dong{i}-dong", str(5000 + i)))
+
+    rows = []
+    t = end
+    start = end - timedelta(days=days)
+    while t > start:
+        stamp = t.strftime("%Y-%m-%d_%H:%M:%S")
+        reg = (t + timedelta(minutes=7)).strftime("%Y-%m-%d %H:%M:%S.0")
+        for region, gu, dong, serial in sensor_list:
+            rows.append({
+                "MODEL_NM": "DOTS-V",
+                "SERIAL_NO": serial,
+                "SENSING_TIME": stamp,
+                "REGION": region,
+                "AUTONOMOUS_DISTRICT": gu,
+                "ADMINISTRATIVE_DISTRICT": dong,
+                "VISITOR_COUNT": rng.randint(0, 400),
+                "REG_DTTM": reg,
+            })
+        t -= timedelta(minutes=interval_min)
+    return rows
+
+
+def render_page(rows: list, total: int) -> bytes:
+    parts = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><IotVdata018><list_total_count>{total}</list_total_count>']
+    if not rows:
+        parts.append("<RESULT><CODE>INFO-200</CODE><MESSAGE>해당하는 데이터가 없습니다.</MESSAGE></RESULT>")
+    else:
+        parts.append("<RESULT><CODE>INFO-000</CODE><MESSAGE>정상 처리되었습니다</MESSAGE></RESULT>")
+    for r in rows:
+        parts.append("<row>")
+        for key, value in r.items():
+            if value is not None:
+                parts.append(f"<{key}>{escape(str(value))}</{key}>")
+        parts.append("</row>")
+    parts.append("</IotVdata018>")
+    return "".join(parts).encode("utf-8")
+
+
+# http://127.0.0.1:<port>/<key>/xml/IotVdata018/<start>/<end> 를 흉내내는 서버
+class StandInServer:
+    PATH = re.compile(r"^/[^/]+/xml/IotVdata018/(\d+)/(\d+)/?$")
+
+    def __init__(self, rows: list, latency: float = 0.05, max_window: int = 1000):
+        self.rows = rows
+        self.latency = latency
+        self.max_window = max_window
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                m = server.PATH.match(self.path)
+                if not m:
+                    self.send_error(404)
+                    return
+                start, end = int(m.group(1)), int(m.group(2))
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+                if end - start + 1 > server.max_window:
+                    body = (b'<?xml version="1.0" encoding="UTF-8"?><RESULT><CODE>ERROR-336</CODE>'
+                            b'<MESSAGE>1000</MESSAGE></RESULT>')
+                else:
+                    body = render_page(server.rows[start - 1:end], len(server.rows))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml;charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import time
+from typing import Optional
+
+import pandas as pd
+from pymysql.constants import CLIENT
+
+# park / main_street 대량 적재
+# - 튜플은 열 단위(벡터화)로 생성
+# - batch_size 행씩 다중 VALUES INSERT, 또는 서버가 허용하면 LOAD DATA LOCAL INFILE
+#   (LOCAL INFILE 은 중복 키를 IGNORE 로 처리하므로 auto 에서는 ignore=True 일 때만 사용)
+# - commit_every 행마다 커밋하고 처리량(rows/s) 출력
+
+DEFAULT_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '2000'))
+DEFAULT_COMMIT_EVERY = int(os.getenv('DB_COMMIT_EVERY', '50000'))
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# DataFrame → DB 컬럼명 기준 DataFrame (datetime_columns 는 문자열로 한 번에 변환)
+def prepare_frame(df: pd.DataFrame, column_map: dict, datetime_columns: tuple = ()) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    for db_col, df_col in column_map.items():
+        values = df[df_col]
+        if db_col in datetime_columns:
+            values = pd.to_datetime(values).dt.strftime(DATETIME_FORMAT)
+        out[db_col] = values
+    return out.reset_index(drop=True)
+
+
+# 열 단위 tolist() 후 zip (NaN/NaT/NA → None, numpy 스칼라 → 파이썬 기본형), extra 는 모든 행 끝에 덧붙임
+# float/datetime 열은 where(…, None) 이 다시 NaN 으로 바뀌므로 빈 값이 있으면 object 로 바꾼 뒤 None 으로 채움
+def frame_to_rows(df: pd.DataFrame, extra: tuple = ()) -> list:
+    columns = []
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object or pd.api.types.is_string_dtype(values):
+            values = values.astype(object)
+        missing = values.isna()
+        if missing.any():
+            values = values.astype(object).where(~missing, None)
+        columns.append(values.tolist())
+    if extra:
+        return [row + extra for row in zip(*columns)]
+    return list(zip(*columns))
+
+
+def local_infile_available(conn) -> bool:
+    if not conn.client_flag & CLIENT.LOCAL_FILES:
+        return False
+    cursor = conn.cursor()
+    cursor.execute("SELECT @@local_infile")
+    enabled = cursor.fetchone()[0]
+    cursor.close()
+    return bool(int(enabled))
+
+
+def _insert_prefix(table: str, columns: list, ignore: bool) -> str:
+    return f"INSERT {'IGNORE ' if ignore else ''}INTO {table} ({', '.join(columns)}) VALUES "
+
+
+# 다중 VALUES INSERT 한 번 실행
+def _insert_batch(cursor, prefix: str, suffix: str, rows: list) -> int:
+    placeholder = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    query = prefix + ", ".join([placeholder] * len(rows)) + suffix
+    return cursor.execute(query, [value for row in rows for value in row])
+
+
+# LOAD DATA 기본 형식의 TSV (역슬래시/탭/개행 이스케이프, NULL 은 \N)
+def _to_tsv(df: pd.DataFrame) -> str:
+    columns = []
+    for col in df.columns:
+        values = df[col]
+        text = (values.astype(str)
+                .str.replace('\\', '\\\\', regex=False)
+                .str.replace('\t', '\\t', regex=False)
+                .str.replace('\n', '\\n', regex=False))
+        columns.append(text.where(values.notna(), '\\N'))
+    return '\n'.join(columns[0].str.cat(columns[1:], sep='\t')) + '\n'
+
+
+# LOAD DATA LOCAL INFILE 한 번 실행 (임시 TSV 파일 경유)
+def _load_chunk(cursor, table: str, df: pd.DataFrame, ignore: bool, constants: dict) -> int:
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8', newline='') as f:
+        f.write(_to_tsv(df))
+        path = f.name
+    try:
+        query = (
+            f"LOAD DATA LOCAL INFILE %s {'IGNORE' if ignore else ''} INTO TABLE {table} "
+            f"CHARACTER SET utf8 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(df.columns)})"
+        )
+        args = [path]
+        if constants:
+            query += " SET " + ", ".join(f"{col} = %s" for col in constants)
+            args += list(constants.values())
+        return cursor.execute(query, args)
+    finally:
+        os.remove(path)
+
+
+# column_map: {DB 컬럼: DataFrame 컬럼}, constants: 모든 행에 같은 값 (created_at 등)
+# method: 'auto' | 'insert' | 'infile', 영향받은 행 수 반환
+# commit=False 면 커밋/롤백 없이 실행만 (여러 테이블을 한 트랜잭션으로 묶을 때 호출하는 쪽에서 처리)
+def bulk_insert(conn, table: str, df: pd.DataFrame, column_map: dict, datetime_columns: tuple = (),
+                constants: Optional[dict] = None, ignore: bool = False, on_duplicate: str = "",
+                batch_size: int = DEFAULT_BATCH_SIZE, commit_every: int = DEFAULT_COMMIT_EVERY,
+                method: str = 'auto', label: Optional[str] = None, commit: bool = True) -> int:
+    label = label or table
+    constants = constants or {}
+    frame = prepare_frame(df, column_map, datetime_columns)
+    if frame.empty:
+        print(f"[{label}] 저장할 데이터 없음")
+        return 0
+
+    if method == 'auto':
+        method = 'infile' if ignore and not on_duplicate and local_infile_available(conn) else 'insert'
+
+    started = time.perf_counter()
+    affected = 0
+    cursor = conn.cursor()
+    try:
+        for offset in range(0, len(frame), commit_every):
+            chunk = frame.iloc[offset:offset + commit_every]
+            if method == 'infile':
+                affected += _load_chunk(cursor, table, chunk, ignore, constants)
+            else:
+                prefix = _insert_prefix(table, list(chunk.columns) + list(constants), ignore)
+                suffix = f" ON DUPLICATE KEY UPDATE {on_duplicate}" if on_duplicate else ""
+                rows = frame_to_rows(chunk, tuple(constants.values()))
+                for start in range(0, len(rows), batch_size):
+                    affected += _insert_batch(cursor, prefix, suffix, rows[start:start + batch_size])
+            if commit:
+                conn.commit()
+    except Exception:
+        if commit:
+            conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"[{label}] {len(frame)}행 적재 ({method}, {elapsed:.2f}s, {len(frame) / max(elapsed, 1e-9):,.0f} rows/s)")
+    return affected
@@ -1,50 +1,29 @@
+import numpy as np
 import pandas as pd
-import pymysql
-import pytz
+import db
+import delta_writer
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import os
 
 # .env 로드
 load_dotenv()
 
-# DB 연결 함수
-def get_connection():
-    return pymysql.connect(
-        host=os.getenv('DB_HOST'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        db=os.getenv('DB_NAME'),
-        charset='utf8'
-    )
-
-# 공원 혼잡도 기준
-def get_park_congestion_label(visitors, area_m2):
-    if visitors == 0:
-        return "여유"
-    per_capita_area = area_m2 / visitors
-    if per_capita_area >= 100:
-        return "여유"
-    elif per_capita_area >= 50:
-        return "보통"
-    elif per_capita_area >= 20:
-        return "약간 혼잡"
-    else:
-        return "혼잡"
-
-# 거리 혼잡도 기준
-def get_street_congestion_label(visitors, area_m2):
-    if visitors == 0:
-        return "여유"
-    per_capita_area = area_m2 / visitors
-    if per_capita_area >= 9.29:
-        return "여유"
-    elif per_capita_area >= 4.61:
-        return "보통"
-    elif per_capita_area >= 2.81:
-        return "약간 혼잡"
-    else:
-        return "혼잡"
+# 혼잡도 단계 (1인당 면적이 작은 순) 와 장소 종류별 단계 경계 (경계 이상이면 다음 단계)
+# 공원: 20㎡ 미만 혼잡, 50㎡ 미만 약간 혼잡, 100㎡ 미만 보통, 이상 여유 / 거리: 2.81, 4.61, 9.29㎡
+CONGESTION_LEVELS = np.array(["혼잡", "약간 혼잡", "보통", "여유"], dtype=object)
+CONGESTION_THRESHOLDS = {
+    "park": np.array([20, 50, 100]),
+    "mainstreet": np.array([2.81, 4.61, 9.29]),
+}
+
+# 1인당 면적 → 혼잡도 라벨 (체류 인구 0 이면 여유)
+def congestion_labels(place_types: np.ndarray, per_capita_area: np.ndarray, stay_population: np.ndarray) -> np.ndarray:
+    levels = np.full(len(per_capita_area), len(CONGESTION_LEVELS) - 1)
+    for place_type, thresholds in CONGESTION_THRESHOLDS.items():
+        mask = place_types == place_type
+        levels[mask] = np.searchsorted(thresholds, per_capita_area[mask], side='right')
+    levels[stay_population <= 0] = len(CONGESTION_LEVELS) - 1
+    return CONGESTION_LEVELS[levels]
 
 # 장소별 설정 (공원 + 거리)
 place_settings = {
@@ -60,101 +39,115 @@ place_settings = {
     "샤로수길": {"type": "mainstreet", "area_m2": 70056.9, "stay_hours": 3, "scaling_factor": 50},
 }
 
-# 혼잡도 계산 및 저장
-def process_place_congestion(name, start_date, end_date):
-    settings = place_settings.get(name)
-    if not settings:
-        print(f"[{name}] 설정 없음, 스킵")
-        return
-
-    place_type = settings["type"]
-    area_m2 = settings["area_m2"]
-    stay_hours = settings["stay_hours"]
-    scaling_factor = settings["scaling_factor"]
-
-    conn = get_connection()
-    cursor = conn.cursor()
+# 장소별 체류 인구: 유입(yhat × scaling_factor)을 장소 안에서 현재 포함 최근 stay_hours 시간만큼 합산
+# 시차별로 밀어 더하는 창 합계 (stay_hours 번), 누적합 차이와 달리 창 안이 모두 0 이면 정확히 0
+# rows 는 장소별로 연속, group_start 는 각 행이 속한 장소의 첫 행 번호
+def stay_population(incoming: np.ndarray, group_start: np.ndarray, stay_hours: np.ndarray) -> np.ndarray:
+    rows = np.arange(len(incoming))
+    population = np.zeros(len(incoming))
+    for lag in range(int(stay_hours.max(initial=0))):
+        source = rows - lag
+        valid = (lag < stay_hours) & (source >= group_start)
+        population[valid] += incoming[source[valid]]
+    return np.maximum(population, 0)
+
+# 예측(name, forecast_date, forecast_hour, yhat) → 혼잡도 행, 모든 장소를 한 번에 계산 (설정 없는 장소는 제외)
+def compute_congestion(forecast_df: pd.DataFrame) -> pd.DataFrame:
+    df = forecast_df[forecast_df['name'].isin(place_settings.keys())]
+    df = df.sort_values(['name', 'forecast_date', 'forecast_hour'], kind='stable').reset_index(drop=True)
+    settings = pd.DataFrame.from_dict(place_settings, orient='index').loc[df['name']]
+
+    names = df['name'].to_numpy()
+    first = np.concatenate([[True], names[1:] != names[:-1]]) if len(names) else np.zeros(0, dtype=bool)
+    group_start = np.flatnonzero(first)[np.cumsum(first) - 1]
+    incoming = df['yhat'].to_numpy(dtype=float) * settings['scaling_factor'].to_numpy(dtype=float)
+    population = stay_population(incoming, group_start, settings['stay_hours'].to_numpy(dtype='int64'))
+
+    area = settings['area_m2'].to_numpy(dtype=float)
+    safe_population = np.where(population > 0, population, 1.0)
+    per_capita_area = np.where(population > 0, area / safe_population, area)
+    place_types = settings['type'].to_numpy()
+    return pd.DataFrame({
+        'name': names,
+        'type': place_types,
+        'congestion_date': df['forecast_date'].to_numpy(),
+        'congestion_hour': df['forecast_hour'].to_numpy(dtype='int64'),
+        'congestion_level': congestion_labels(place_types, per_capita_area, population),
+        'per_capita_area': per_capita_area,
+        'stay_population': population,
+    })
+
+# 혼잡도 upsert 시 갱신하는 컬럼
+UPSERT_UPDATE = (
+    "congestion_level = VALUES(congestion_level), per_capita_area = VALUES(per_capita_area), "
+    "stay_population = VALUES(stay_population), updated_at = VALUES(updated_at)"
+)
+
+# congestion upsert 키 / 비교 컬럼
+CONGESTION_KEYS = ['name', 'type', 'congestion_date', 'congestion_hour']
+CONGESTION_VALUES = ['congestion_level', 'per_capita_area', 'stay_population']
+
+# 예측 구간 조회용 (날짜 범위 + 장소) 인덱스
+FORECAST_INDEXES = {
+    'forecast': ('idx_forecast_date_name', ['forecast_date', 'name', 'type']),
+}
 
-    query = """
-        SELECT forecast_date, forecast_hour, yhat
+# 설정된 장소들의 [start_date, end_date] 예측을 한 번에 조회 (장소별 type 이 설정과 같은 행만)
+def load_forecasts(start_date, end_date, names=None) -> pd.DataFrame:
+    names = list(names or place_settings.keys())
+    placeholders = ", ".join(["%s"] * len(names))
+    query = f"""
+        SELECT name, type, forecast_date, forecast_hour, yhat
         FROM forecast
-        WHERE name = %s AND type = %s
-        AND forecast_date BETWEEN %s AND %s
-        ORDER BY forecast_date, forecast_hour
-    """
-    df = pd.read_sql(query, conn, params=[name, place_type, start_date, end_date])
-
-    if df.empty:
-        print(f"[{name}] 예측 데이터 없음, 스킵")
-        cursor.close()
-        conn.close()
-        return
-
-    now_kst = datetime.now(pytz.timezone('Asia/Seoul'))
-    stay_history = []
-    stay_population = 0
-    insert_data = []
-
-    for _, row in df.iterrows():
-        incoming = row['yhat'] * scaling_factor
-        stay_history.append(incoming)
-        stay_population += incoming
-
-        if len(stay_history) > stay_hours:
-            stay_population -= stay_history[-(stay_hours+1)]
-
-        stay_population = max(stay_population, 0)
-
-        # 혼잡도 라벨 선택
-        if place_type == "park":
-            label = get_park_congestion_label(stay_population, area_m2)
-        else:
-            label = get_street_congestion_label(stay_population, area_m2)
-
-        per_capita_area = area_m2 / stay_population if stay_population > 0 else area_m2
-
-        insert_data.append((
-            name, place_type,
-            row['forecast_date'],
-            int(row['forecast_hour']),
-            label,
-            per_capita_area,
-            stay_population,
-            now_kst, now_kst
-        ))
-
-
-
-    insert_query = """
-        INSERT INTO congestion
-        (name, type, congestion_date, congestion_hour, congestion_level, per_capita_area, stay_population, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            congestion_level = VALUES(congestion_level),
-            per_capita_area = VALUES(per_capita_area),
-            stay_population = VALUES(stay_population),
-            updated_at = VALUES(updated_at)
+        WHERE forecast_date BETWEEN %s AND %s
+        AND name IN ({placeholders})
+        ORDER BY name, forecast_date, forecast_hour
     """
-
-
-
-    if insert_data:
-        cursor.executemany(insert_query, insert_data)
-        conn.commit()
-        print(f"[{place_type.upper()}] {name} → {len(insert_data)}건 혼잡도 저장 완료")
-
-    cursor.close()
-    conn.close()
-
-# 실행
+    return matching_type(db.read_frame(query, [start_date, end_date] + names))
+
+# 예측 행 중 type 이 place_settings 의 장소 종류와 같은 행만
+def matching_type(forecast_df: pd.DataFrame) -> pd.DataFrame:
+    expected_type = forecast_df['name'].map({name: settings["type"] for name, settings in place_settings.items()})
+    return forecast_df[forecast_df['type'] == expected_type].reset_index(drop=True)
+
+# 혼잡도 행의 저장 내용 (predictor 에서 forecast 와 한 트랜잭션으로 쓸 때도 사용)
+def congestion_write(result: pd.DataFrame) -> delta_writer.DeltaWrite:
+    return delta_writer.DeltaWrite('congestion', result, CONGESTION_KEYS, CONGESTION_VALUES, 'congestion_date',
+                                   UPSERT_UPDATE, label='congestion')
+
+# 장소별 혼잡도 건수 출력
+def print_congestion_counts(result: pd.DataFrame) -> None:
+    for (name, place_type), count in result.groupby(['name', 'type'], sort=False).size().items():
+        print(f"[{place_type.upper()}] {name} → {count}건 혼잡도")
+
+# 혼잡도 행 저장 (바뀐 행만 다중 VALUES upsert 로 한 트랜잭션에), {'written', 'skipped'} 반환
+def save_congestion(result: pd.DataFrame, start_date, end_date) -> dict:
+    return delta_writer.delta_upsert(congestion_write(result), start_date, end_date)
+
+# 저장된 예측으로 혼잡도 다시 계산 및 저장 (names 가 없으면 설정된 전체 장소)
+# 야간 파이프라인은 predictor 가 예측과 혼잡도를 함께 저장, 이 경로는 저장된 예측으로 다시 계산할 때만 사용
+def process_congestion(start_date, end_date, names=None) -> pd.DataFrame:
+    names = list(names or place_settings.keys())
+    forecasts = load_forecasts(start_date, end_date, names)
+    found = set(forecasts['name'])
+    for name in names:
+        if name not in found:
+            print(f"[{name}] 예측 데이터 없음, 스킵")
+
+    result = compute_congestion(forecasts)
+    print_congestion_counts(result)
+    save_congestion(result, start_date, end_date)
+    return result
+
+# 실행 (저장된 예측으로 혼잡도만 다시 계산)
 def main():
-    all_places = list(place_settings.keys())
     today = datetime.today().date()
     start_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
     end_date = (today + timedelta(days=7)).strftime('%Y-%m-%d')
 
-    for name in all_places:
-        process_place_congestion(name, start_date, end_date)
+    db.ensure_indexes(FORECAST_INDEXES)
+    process_congestion(start_date, end_date)
 
 if __name__ == '__main__':
     main()
+    db.report()
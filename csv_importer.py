@@ -0,0 +1,116 @@
+import hashlib
+import io
+import json
+import os
+import time
+from itertools import islice
+from typing import Callable, Optional
+
+import pandas as pd
+
+import bulk_loader
+
+# 분기 CSV 스트리밍 적재
+# - chunksize 행씩 읽어 벡터화 변환 후 청크마다 커밋
+# - 체크포인트(파일 해시 + 행/바이트 오프셋)로 중단된 지점부터 재개
+# - 한 줄 = 한 행인 CSV 기준 (따옴표 안 줄바꿈 없음)
+
+DEFAULT_CHUNKSIZE = 50000
+
+
+def file_sha256(path: str, block_size: int = 2**20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def checkpoint_path_for(path: str, table: str) -> str:
+    return f"{path}.{table}.ckpt.json"
+
+
+def load_checkpoint(checkpoint_path: str, sha256: str) -> dict:
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('sha256') == sha256:
+            return checkpoint
+        print(f"[CSV] 파일이 변경되어 체크포인트 무시: {checkpoint_path}")
+    return {'sha256': sha256, 'rows_done': 0, 'byte_offset': 0, 'completed': False, 'after_chunk_pending': None}
+
+
+def save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def read_chunk(header: bytes, lines: list, names: list, usecols: Optional[list], encoding: str) -> pd.DataFrame:
+    chunk = pd.read_csv(io.BytesIO(header + b''.join(lines)), usecols=usecols, encoding=encoding)
+    chunk.columns = names
+    return chunk
+
+
+# path 의 CSV 를 table 에 적재
+# usecols 로 읽은 열(파일 순서)에 names 를 순서대로 DB 컬럼명으로 붙임
+# 청크 커밋 직후 체크포인트를 저장해 재실행 시 같은 청크를 다시 넣지 않음
+# after_chunk(chunk) 는 그 다음에 호출, 끝나기 전 중단되면 체크포인트의 after_chunk_pending 구간으로 재개 시 다시 호출
+def import_csv(conn, path: str, table: str, names: list, usecols: Optional[list] = None,
+               datetime_columns: tuple = (), constants: Optional[dict] = None, ignore: bool = False,
+               chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8',
+               checkpoint_path: Optional[str] = None,
+               after_chunk: Optional[Callable[[pd.DataFrame], None]] = None) -> int:
+    checkpoint_path = checkpoint_path or checkpoint_path_for(path, table)
+    checkpoint = load_checkpoint(checkpoint_path, file_sha256(path))
+    if checkpoint['completed']:
+        print(f"[CSV] 이미 적재 완료된 파일: {path} ({checkpoint['rows_done']}건)")
+        return 0
+    if checkpoint['rows_done']:
+        print(f"[CSV] {checkpoint['rows_done']}행부터 재개")
+
+    started = time.perf_counter()
+    imported = 0
+    with open(path, 'rb') as f:
+        header = f.readline()
+        pending = checkpoint.get('after_chunk_pending')
+        if pending and after_chunk is not None:
+            print(f"[CSV] 후처리가 끝나지 않은 청크 재실행 ({pending[0]}~{pending[1]} 바이트)")
+            f.seek(pending[0])
+            after_chunk(read_chunk(header, list(islice(f, pending[2])), names, usecols, encoding))
+            checkpoint['after_chunk_pending'] = None
+            save_checkpoint(checkpoint_path, checkpoint)
+        if checkpoint['byte_offset']:
+            f.seek(checkpoint['byte_offset'])
+
+        while True:
+            lines = list(islice(f, chunksize))
+            if not lines:
+                break
+            chunk = read_chunk(header, lines, names, usecols, encoding)
+
+            bulk_loader.bulk_insert(
+                conn, table, chunk, {col: col for col in names},
+                datetime_columns=datetime_columns, constants=constants, ignore=ignore,
+                commit_every=max(chunksize, len(chunk)), label=f"{table} CSV"
+            )
+            chunk_offset = checkpoint['byte_offset'] or len(header)
+
+            imported += len(lines)
+            checkpoint['rows_done'] += len(lines)
+            checkpoint['byte_offset'] = f.tell()
+            if after_chunk is not None:
+                checkpoint['after_chunk_pending'] = [chunk_offset, checkpoint['byte_offset'], len(lines)]
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            if after_chunk is not None:
+                after_chunk(chunk)
+                checkpoint['after_chunk_pending'] = None
+                save_checkpoint(checkpoint_path, checkpoint)
+
+    checkpoint['completed'] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    elapsed = time.perf_counter() - started
+    print(f"[CSV] {path} → {table} {imported}행 ({elapsed:.1f}s, {imported / max(elapsed, 1e-9):,.0f} rows/s)")
+    return imported
@@ -0,0 +1,162 @@
+import os
+import re
+import time
+from collections import defaultdict
+
+import pandas as pd
+import pymysql
+from pymysql.cursors import Cursor, SSCursor
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+# 공용 DB 계층
+# - SQLAlchemy 풀 엔진 하나를 프로세스 전체가 공유 (get_connection().close() 는 풀 반납)
+# - 모든 커서 실행 시간/행 수를 쿼리별로 집계, report() 로 출력
+# - 큰 조회는 서버측 커서(SSCursor)로 배치 스트리밍
+
+# .env 파일 로드
+load_dotenv()
+
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+STREAM_BATCH_SIZE = 50000
+
+_engine = None
+_stats = defaultdict(lambda: [0, 0.0, 0.0, 0])   # 쿼리 → [횟수, 총 시간, 최대 시간, 행 수]
+_connects = 0
+
+
+# 쿼리 집계 키: 공백 정리 후 첫 80자 (다중 VALUES 는 한 덩어리로)
+def _query_key(query) -> str:
+    text = re.sub(r'\s+', ' ', str(query)).strip()
+    text = re.sub(r'VALUES \(.*', 'VALUES ...', text)
+    return text[:80]
+
+
+def _record(query, elapsed: float, rowcount) -> None:
+    stat = _stats[_query_key(query)]
+    stat[0] += 1
+    stat[1] += elapsed
+    stat[2] = max(stat[2], elapsed)
+    if rowcount is not None and 0 <= rowcount < 2**63:
+        stat[3] += rowcount
+
+
+# execute 시간 측정 (executemany 도 내부에서 execute 를 거침)
+class _TimedMixin:
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            _record(query, time.perf_counter() - started, self.rowcount)
+
+
+class TimedCursor(_TimedMixin, Cursor):
+    pass
+
+
+class TimedSSCursor(_TimedMixin, SSCursor):
+    pass
+
+
+def _connect():
+    global _connects
+    _connects += 1
+    return pymysql.connect(
+        host=os.getenv('DB_HOST'),
+        user=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        db=os.getenv('DB_NAME'),
+        charset='utf8',
+        local_infile=os.getenv('DB_LOCAL_INFILE') == '1',
+        cursorclass=TimedCursor
+    )
+
+
+# 풀 엔진 (처음 호출 시 생성)
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            'mysql+pymysql://', creator=_connect,
+            pool_size=POOL_SIZE, max_overflow=POOL_SIZE, pool_pre_ping=True, pool_recycle=POOL_RECYCLE
+        )
+    return _engine
+
+
+# 풀에서 DBAPI 연결 대여 (close() 시 풀로 반납)
+def get_connection():
+    return get_engine().raw_connection()
+
+
+# 조회 결과를 DataFrame 으로
+def read_frame(query: str, params=None) -> pd.DataFrame:
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return pd.DataFrame(list(rows), columns=columns)
+
+
+# 서버측 커서로 batch_size 행씩 DataFrame 반환 (결과 전체를 클라이언트에 올리지 않음)
+def stream_frames(query: str, params=None, batch_size: int = STREAM_BATCH_SIZE):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor(TimedSSCursor)
+        cursor.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        empty = True
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            empty = False
+            yield pd.DataFrame(list(rows), columns=columns)
+        if empty:
+            yield pd.DataFrame(columns=columns)
+        cursor.close()
+    finally:
+        conn.close()
+
+
+# {테이블: (인덱스명, [컬럼])} 중 없는 인덱스만 생성
+def ensure_indexes(indexes: dict) -> None:
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        for table, (index_name, columns) in indexes.items():
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+                [table, index_name]
+            )
+            if cursor.fetchone()[0]:
+                continue
+            cursor.execute(f"CREATE INDEX {index_name} ON {table} ({', '.join(columns)})")
+            print(f"[DB] 인덱스 생성: {table}({', '.join(columns)})")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+# 연결 수 + 쿼리별 실행 통계 출력 (총 시간 순)
+def report(limit: int = 10) -> None:
+    if not _stats:
+        return
+    total = sum(stat[1] for stat in _stats.values())
+    count = sum(stat[0] for stat in _stats.values())
+    print(f"[DB] 연결 {_connects}회, 쿼리 {count}회, {total:.2f}s")
+    for key, (n, elapsed, slowest, rows) in sorted(_stats.items(), key=lambda item: -item[1][1])[:limit]:
+        print(f"  {elapsed:7.2f}s  {n:>5}회  최대 {slowest:6.2f}s  {rows:>9}행  {key}")
+
+
+def reset_stats() -> None:
+    global _connects
+    _stats.clear()
+    _connects = 0
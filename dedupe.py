@@ -0,0 +1,211 @@
+import argparse
+import io
+import math
+import os
+import shutil
+import tempfile
+import time
+from itertools import compress, islice
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+# CSV 스트리밍 중복 제거 (out-of-core)
+# - 청크 단위로 읽어 키 컬럼의 64비트 해시만 정렬된 numpy 배열 집합으로 보관
+# - 집합이 max_memory_mb 를 넘으면 나머지는 디스크 해시 버킷(해시, 행번호)으로 분할해
+#   버킷별로 중복 행번호를 찾고 한 번 더 읽어 기록 (2-pass)
+# - 원본 줄을 그대로 출력하고 첫 등장 행을 남김 (drop_duplicates(keep='first') 와 동일)
+# - 한 줄 = 한 행인 CSV 기준, 여러 파일을 이어서 하나로 중복 제거 가능 (헤더 동일해야 함)
+
+SCHEMA_KEYS = {
+    'park': ['측정시간', '행정동', '방문자수', '구', '공원명'],
+    'main_street': ['시리얼', '측정시간', '지역', '행정동', '방문자수', '구'],
+}
+
+DEFAULT_CHUNKSIZE = 200000
+DEFAULT_MAX_MEMORY_MB = int(os.getenv('DEDUPE_MAX_MEMORY_MB', '256'))
+RECORD = np.dtype([('h', '<u8'), ('row', '<i8')])
+
+
+# 정렬된 해시 배열 여러 개(크기가 기하급수로 커지는 run)로 된 집합, 조회는 run 별 이진 탐색
+class HashSet:
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for run in self.runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            pos = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            found |= run[pos] == hashes
+        return found
+
+    # hashes: 정렬·유일하고 아직 집합에 없는 값
+    def add(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        run = hashes
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.union1d(self.runs.pop(), run)
+        self.runs.append(run)
+
+
+# 헤더가 같은지 확인하고 첫 파일 헤더 반환
+def read_header(paths: list) -> bytes:
+    headers = set()
+    for path in paths:
+        with open(path, 'rb') as f:
+            headers.add(f.readline().lstrip(b'\xef\xbb\xbf').rstrip(b'\r\n'))
+    if len(headers) != 1:
+        raise ValueError(f"CSV 헤더가 서로 다름: {paths}")
+    with open(paths[0], 'rb') as f:
+        return f.readline()
+
+
+# (파일 번호, 바이트 위치) start 부터 chunksize 줄씩 반환
+def iter_chunks(paths: list, chunksize: int, start: tuple = (0, None)):
+    file_index, offset = start
+    for i in range(file_index, len(paths)):
+        with open(paths[i], 'rb') as f:
+            f.readline()
+            if i == file_index and offset is not None:
+                f.seek(offset)
+            while True:
+                lines = list(islice(f, chunksize))
+                if not lines:
+                    break
+                if not lines[-1].endswith(b'\n'):
+                    lines[-1] += b'\n'
+                yield lines, (i, f.tell())
+
+
+# 키 컬럼을 문자열 그대로 읽어 행별 64비트 해시 (청크마다 dtype 추론이 달라지지 않도록)
+def key_hashes(header: bytes, lines: list, keys: list) -> np.ndarray:
+    chunk = pd.read_csv(io.BytesIO(header + b''.join(lines)), usecols=keys, dtype=str,
+                        keep_default_na=False, encoding='utf-8-sig')
+    return pd.util.hash_pandas_object(chunk[keys], index=False).to_numpy()
+
+
+def _bucket_count(paths: list, start: tuple, seen_len: int, avg_line: float, max_bytes: int) -> int:
+    file_index, offset = start
+    remaining = os.path.getsize(paths[file_index]) - offset
+    remaining += sum(os.path.getsize(path) for path in paths[file_index + 1:])
+    est_rows = remaining / max(avg_line, 1) + seen_len
+    return max(16, math.ceil(est_rows * RECORD.itemsize * 2 / max_bytes))
+
+
+def _write_buckets(handles: list, hashes: np.ndarray, rows: np.ndarray) -> None:
+    records = np.empty(len(hashes), dtype=RECORD)
+    records['h'] = hashes
+    records['row'] = rows
+    bucket = hashes % np.uint64(len(handles))
+    order = np.argsort(bucket, kind='stable')
+    bounds = np.searchsorted(bucket[order], np.arange(len(handles) + 1))
+    for b, handle in enumerate(handles):
+        if bounds[b] < bounds[b + 1]:
+            handle.write(records[order[bounds[b]:bounds[b + 1]]].tobytes())
+
+
+# 집합이 메모리 한도를 넘은 뒤의 나머지 행 처리 (기존 집합은 row=-1 로 버킷에 기록해 항상 먼저 온 것으로 취급)
+def _spill(paths: list, header: bytes, keys: list, out, seen: HashSet, start: tuple,
+           chunksize: int, n_buckets: int, tmp_dir=None) -> tuple:
+    workdir = tempfile.mkdtemp(prefix='dedupe_', dir=tmp_dir)
+    try:
+        handles = [open(os.path.join(workdir, f"{b:04d}.bin"), 'wb') for b in range(n_buckets)]
+        for run in seen.runs:
+            _write_buckets(handles, run, np.full(len(run), -1, dtype=np.int64))
+        seen.runs.clear()
+
+        total = 0
+        for lines, _ in iter_chunks(paths, chunksize, start):
+            hashes = key_hashes(header, lines, keys)
+            _write_buckets(handles, hashes, np.arange(total, total + len(lines), dtype=np.int64))
+            total += len(lines)
+        for handle in handles:
+            handle.close()
+
+        # 버킷별로 (해시, 행번호) 정렬 → 같은 해시의 두 번째 이후가 중복
+        duplicates = []
+        for b in range(n_buckets):
+            records = np.fromfile(os.path.join(workdir, f"{b:04d}.bin"), dtype=RECORD)
+            if len(records) < 2:
+                continue
+            records = records[np.lexsort((records['row'], records['h']))]
+            repeated = records['h'][1:] == records['h'][:-1]
+            duplicates.append(records['row'][1:][repeated])
+        duplicates = np.sort(np.concatenate(duplicates)) if duplicates else np.empty(0, dtype=np.int64)
+
+        row = 0
+        for lines, _ in iter_chunks(paths, chunksize, start):
+            lo, hi = np.searchsorted(duplicates, [row, row + len(lines)])
+            keep = np.ones(len(lines), dtype=bool)
+            keep[duplicates[lo:hi] - row] = False
+            out.writelines(compress(lines, keep))
+            row += len(lines)
+        return total, total - len(duplicates)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# sources(하나 또는 여러 CSV) 를 keys 기준으로 중복 제거해 dst 에 기록, 통계 dict 반환
+def dedupe_csv(sources: Union[str, list], dst: str, keys: list, chunksize: int = DEFAULT_CHUNKSIZE,
+               max_memory_mb: float = DEFAULT_MAX_MEMORY_MB, tmp_dir=None) -> dict:
+    paths = [sources] if isinstance(sources, str) else list(sources)
+    header = read_header(paths)
+    max_bytes = int(max_memory_mb * 2**20)
+
+    started = time.perf_counter()
+    seen = HashSet()
+    total = kept = 0
+    line_bytes = 0
+    spilled = False
+    tmp_dst = dst + '.tmp'
+    with open(tmp_dst, 'wb') as out:
+        out.write(header)
+        for lines, position in iter_chunks(paths, chunksize):
+            hashes = key_hashes(header, lines, keys)
+            uniques, first = np.unique(hashes, return_index=True)
+            new = ~seen.contains(uniques)
+            keep = np.zeros(len(lines), dtype=bool)
+            keep[first[new]] = True
+            out.writelines(compress(lines, keep))
+            seen.add(uniques[new])
+
+            total += len(lines)
+            kept += int(new.sum())
+            line_bytes += sum(map(len, lines))
+
+            if seen.nbytes > max_bytes:
+                spilled = True
+                n_buckets = _bucket_count(paths, position, len(seen), line_bytes / total, max_bytes)
+                print(f"[DEDUPE] 해시 집합 {seen.nbytes / 2**20:.0f}MiB 초과 → 디스크 버킷 {n_buckets}개로 전환")
+                rest_total, rest_kept = _spill(paths, header, keys, out, seen, position, chunksize, n_buckets, tmp_dir)
+                total += rest_total
+                kept += rest_kept
+                break
+    os.replace(tmp_dst, dst)
+
+    elapsed = time.perf_counter() - started
+    stats = {'rows': total, 'kept': kept, 'duplicates': total - kept, 'spilled': spilled, 'seconds': elapsed}
+    print(f"[DEDUPE] {total}행 중 {total - kept}건 중복 제거 → {dst} ({elapsed:.1f}s, {total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return stats
+
+
+# 실행
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="CSV 스트리밍 중복 제거")
+    parser.add_argument('sources', nargs='+', help="입력 CSV (여러 개면 이어서 하나로 중복 제거)")
+    parser.add_argument('--out', required=True, help="출력 CSV")
+    parser.add_argument('--schema', choices=list(SCHEMA_KEYS), required=True, help="키 컬럼 프리셋")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--max-memory-mb', type=float, default=DEFAULT_MAX_MEMORY_MB, help="해시 집합 메모리 한도")
+    args = parser.parse_args()
+
+    dedupe_csv(args.sources, args.out, SCHEMA_KEYS[args.schema], args.chunksize, args.max_memory_mb)
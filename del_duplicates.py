@@ -1,12 +1,10 @@
-import pandas as pd
+import dedupe
 
-# CSV 파일 불러오기
-df = pd.read_csv('dataset/main_street/2025Q2_메인거리데이터.csv')
+# 시리얼, 측정시간, 지역, 행정동, 방문자수, 구 6개 컬럼 기준으로 중복 제거 (청크 스트리밍)
+stats = dedupe.dedupe_csv(
+    'dataset/main_street/2025Q2_메인거리데이터.csv',
+    'dataset/main_street/2025Q2_메인거리데이터_clean.csv',
+    dedupe.SCHEMA_KEYS['main_street']
+)
 
-# measuring_time, dong, park_name, district, visitor_count 이 5개 컬럼 기준으로 중복 제거
-df_dedup = df.drop_duplicates(subset=['시리얼', '측정시간', '지역', '행정동', '방문자수', '구'])
-
-# 결과 저장
-df_dedup.to_csv('dataset/main_street/2025Q2_메인거리데이터_clean.csv', index=False)
-
-print(f"중복 제거 완료! {len(df) - len(df_dedup)}건 제거됨.")
+print(f"중복 제거 완료! {stats['duplicates']}건 제거됨.")
@@ -0,0 +1,129 @@
+import os
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import pytz
+
+import bulk_loader
+import db
+
+# 변경분만 upsert (forecast / congestion 7일 구간)
+# - 저장할 구간의 기존 행을 한 번에 읽어 키로 맞춘 뒤 새로 생기거나 값이 바뀐 행만 기록
+# - 숫자 컬럼은 차이가 DELTA_TOLERANCE 이하면 같은 값, 그 외 컬럼은 완전히 같아야 같은 값
+# - 바뀐 행은 다중 VALUES INSERT ... ON DUPLICATE KEY UPDATE 로 한 트랜잭션에 기록
+# - 여러 테이블(forecast + congestion)도 delta_upsert_many 로 한 트랜잭션에 기록
+# - DB_DELTA_WRITES=0 이면 비교 없이 전체 upsert
+DELTA_WRITES = os.getenv('DB_DELTA_WRITES', '1') != '0'
+DELTA_TOLERANCE = float(os.getenv('DB_DELTA_TOLERANCE', '0.01'))
+
+
+# 키 컬럼을 비교 가능한 형태로 (숫자는 int64, 날짜 등 나머지는 문자열)
+def _key_frame(df: pd.DataFrame, keys: list) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    for key in keys:
+        values = df[key]
+        out[key] = values.astype('int64') if pd.api.types.is_numeric_dtype(values) else values.astype(str)
+    return out
+
+
+# new 중 existing 에 없거나 compare 컬럼 값이 다른 행 표시 (new 와 같은 길이의 bool 배열)
+def changed_mask(new: pd.DataFrame, existing: pd.DataFrame, keys: list, compare: list,
+                 tolerance: float = DELTA_TOLERANCE) -> np.ndarray:
+    if existing.empty:
+        return np.ones(len(new), dtype=bool)
+    left = _key_frame(new, keys)
+    right = _key_frame(existing, keys)
+    for col in compare:
+        right[f"{col}__old"] = existing[col]
+    merged = left.reset_index(drop=True).merge(right.drop_duplicates(subset=keys, keep='last'), on=keys, how='left')
+
+    changed = np.zeros(len(new), dtype=bool)
+    for col in compare:
+        values, old = new[col].reset_index(drop=True), merged[f"{col}__old"]
+        if pd.api.types.is_numeric_dtype(values):
+            a = values.to_numpy(dtype=float)
+            b = pd.to_numeric(old, errors='coerce').to_numpy(dtype=float)
+            same = (np.abs(a - b) <= tolerance) | (np.isnan(a) & np.isnan(b))
+        else:
+            same = (values.astype(str).to_numpy() == old.astype(str).to_numpy()) & old.notna().to_numpy()
+        changed |= ~same
+    return changed
+
+
+# [start_date, end_date] 구간에서 df 의 장소들(name) 기존 행 조회
+def read_window(table: str, date_column: str, keys: list, compare: list,
+                start_date, end_date, names: list) -> pd.DataFrame:
+    placeholders = ", ".join(["%s"] * len(names))
+    return db.read_frame(
+        f"""
+        SELECT {', '.join(keys + compare)}
+        FROM {table}
+        WHERE {date_column} BETWEEN %s AND %s
+        AND name IN ({placeholders})
+        """,
+        [start_date, end_date] + list(names)
+    )
+
+
+# 테이블 하나의 저장 내용 (on_duplicate: 키가 겹칠 때 갱신하는 SET 절)
+class DeltaWrite(NamedTuple):
+    table: str
+    df: pd.DataFrame
+    keys: list
+    compare: list
+    date_column: str
+    on_duplicate: str
+    label: Optional[str] = None
+
+
+# 기록할 행과 {'written', 'skipped'} 반환
+# 같은 키가 여러 번 나오면 마지막 행 기준 (ON DUPLICATE 로 마지막 값이 남던 것과 같음)
+def pending_rows(write: DeltaWrite, start_date, end_date, delta: bool = DELTA_WRITES) -> tuple:
+    df = write.df.drop_duplicates(subset=write.keys, keep='last').reset_index(drop=True)
+    if df.empty or not delta:
+        changed = df
+    else:
+        existing = read_window(write.table, write.date_column, write.keys, write.compare,
+                               start_date, end_date, list(df['name'].unique()))
+        changed = df[changed_mask(df, existing, write.keys, write.compare)]
+    return changed, {'written': len(changed), 'skipped': len(df) - len(changed)}
+
+
+# 여러 테이블의 변경분을 한 연결, 한 트랜잭션으로 upsert (하나라도 실패하면 전체 롤백)
+# {label: {'written': 기록 행 수, 'skipped': 같은 값이라 건너뛴 행 수}} 반환
+def delta_upsert_many(writes: list, start_date, end_date, delta: bool = DELTA_WRITES) -> dict:
+    planned = [(write, *pending_rows(write, start_date, end_date, delta)) for write in writes]
+
+    if any(not changed.empty for _, changed, _ in planned):
+        now_kst = datetime.now(pytz.timezone('Asia/Seoul'))
+        conn = db.get_connection()
+        try:
+            for write, changed, _ in planned:
+                if changed.empty:
+                    continue
+                bulk_loader.bulk_insert(
+                    conn, write.table, changed, {col: col for col in write.keys + write.compare},
+                    constants={'created_at': now_kst, 'updated_at': now_kst},
+                    on_duplicate=write.on_duplicate, method='insert', commit_every=len(changed),
+                    label=write.label or write.table, commit=False
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    results = {}
+    for write, _, stats in planned:
+        label = write.label or write.table
+        print(f"[{label}] 기록 {stats['written']}행, 변경 없음 {stats['skipped']}행 건너뜀")
+        results[label] = stats
+    return results
+
+
+# 테이블 하나의 변경분만 upsert, {'written', 'skipped'} 반환
+def delta_upsert(write: DeltaWrite, start_date, end_date, delta: bool = DELTA_WRITES) -> dict:
+    return delta_upsert_many([write], start_date, end_date, delta)[write.label or write.table]
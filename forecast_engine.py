@@ -0,0 +1,140 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+
+# 같은 구성의 Prophet 모델 여러 개를 한 번에 예측 (yhat 만, 불확실성 구간 없음)
+# - 장소별 예측 시각을 합친 시각 축에 대해 계절성/공휴일 설계 행렬 X 를 한 번만 만듦
+# - 장소별 beta(가법 성분)를 쌓아 X @ B 한 번으로 계절성+공휴일, 추세는 장소별 변화점으로 배열 계산
+# - 선형 추세, 가법 성분, 추가 회귀변수/조건부 계절성 없음을 벗어나는 모델은 model.predict 로 처리
+NON_SEASONAL_MULTIPLICATIVE = ('multiplicative_terms', 'extra_regressors_multiplicative')
+
+
+# 설계 행렬을 같이 쓸 수 있는 모델끼리 같은 값 (지원하지 않는 구성이면 None)
+def signature(model) -> Optional[tuple]:
+    if (model.growth != 'linear' or model.logistic_floor or model.extra_regressors
+            or any(props['condition_name'] is not None for props in model.seasonalities.values())
+            or any(name not in NON_SEASONAL_MULTIPLICATIVE for name in model.component_modes['multiplicative'])):
+        return None
+    seasonalities = tuple((name, tuple(sorted(props.items()))) for name, props in model.seasonalities.items())
+    holidays = None
+    if model.holidays is not None:
+        columns = [(col, model.holidays[col].to_numpy()) for col in model.holidays.columns]
+        holidays = tuple((col, values.tobytes() if values.dtype.kind in 'biufmM' else tuple(values)) for col, values in columns)
+    names = None if model.train_holiday_names is None else tuple(model.train_holiday_names)
+    return seasonalities, names, holidays, str(model.country_holidays), getattr(model, 'holidays_mode', None)
+
+
+# 파라미터 평균 (MAP 학습이면 값 하나라 그대로)
+def _param(model, name: str) -> np.ndarray:
+    value = np.asarray(model.params[name])
+    if value.ndim == 2 and value.shape[0] == 1:
+        return value[0]
+    return np.nanmean(value, axis=0)
+
+
+# 시각 축 grid 의 계절성/공휴일 특징 (N×F), 가법 성분 열 표시 (F)
+# Prophet make_all_seasonality_features 와 같은 열 순서: 계절성 순서대로 푸리에 열, 이어서 '<공휴일>_delim_±<일>' 정렬
+# 공휴일 열은 날짜 단위 일치 여부만 보므로 날짜 배열 비교로 계산
+def design_matrix(model, grid: np.ndarray) -> tuple:
+    dates = pd.Series(grid)
+    blocks, additive = [], []
+    for props in model.seasonalities.values():
+        features = Prophet.fourier_series(dates, props['period'], props['fourier_order'])
+        blocks.append(features)
+        additive += [props['mode'] == 'additive'] * features.shape[1]
+
+    holidays = model.construct_holiday_dataframe(dates)
+    if holidays is not None:
+        occurrences = {}
+        windows = [holidays[col] if col in holidays else pd.Series(0, index=holidays.index)
+                   for col in ('lower_window', 'upper_window')]
+        for holiday, ds, lower, upper in zip(holidays['holiday'], holidays['ds'], *windows):
+            try:
+                lower, upper = int(lower), int(upper)
+            except ValueError:
+                lower, upper = 0, 0
+            for offset in range(lower, upper + 1):
+                days = occurrences.setdefault(f"{holiday}_delim_{'+' if offset >= 0 else '-'}{abs(offset)}", [])
+                if not pd.isna(ds):
+                    days.append(np.datetime64(pd.Timestamp(ds).date(), 'D') + offset)
+        grid_days = grid.astype('datetime64[D]')
+        keys = sorted(occurrences)
+        blocks.append(np.column_stack([
+            np.isin(grid_days, np.array(occurrences[key], dtype='datetime64[D]')) for key in keys
+        ]).astype(float))
+        additive += [getattr(model, 'holidays_mode', model.seasonality_mode) == 'additive'] * len(keys)
+    return np.hstack(blocks), np.array(additive, dtype=float)
+
+
+# 장소별 추세 (P×N): t = (ds - start) / t_scale, 지난 변화점까지의 누적 보정으로 기울기/절편 계산
+def batch_trend(models: list, grid: np.ndarray) -> np.ndarray:
+    start = np.array([model.start.to_datetime64() for model in models], dtype='datetime64[ns]')
+    t_scale = np.array([model.t_scale.to_timedelta64() for model in models], dtype='timedelta64[ns]')
+    t = (grid[None, :] - start[:, None]) / t_scale[:, None]
+
+    # 변화점 수가 다른 모델은 마지막 누적값으로 채움 (searchsorted 결과가 넘지 않음)
+    n_changepoints = max(len(model.changepoints_t) for model in models)
+    slopes = np.zeros((len(models), n_changepoints + 1))
+    offsets = np.zeros((len(models), n_changepoints + 1))
+    passed = np.empty(t.shape, dtype='int64')
+    for i, model in enumerate(models):
+        changepoints = np.asarray(model.changepoints_t, dtype=float)
+        deltas = _param(model, 'delta')
+        slopes[i, 1:len(changepoints) + 1] = np.cumsum(deltas)
+        offsets[i, 1:len(changepoints) + 1] = np.cumsum(-changepoints * deltas)
+        passed[i] = np.searchsorted(changepoints, t[i], side='right')
+
+    k = np.array([_param(model, 'k')[0] for model in models])
+    m = np.array([_param(model, 'm')[0] for model in models])
+    slope = k[:, None] + np.take_along_axis(slopes, passed, axis=1)
+    offset = m[:, None] + np.take_along_axis(offsets, passed, axis=1)
+
+    y_scale = np.array([model.y_scale for model in models])
+    floor = np.array([model.y_min if model.scaling == 'minmax' else 0.0 for model in models])
+    return (slope * t + offset) * y_scale[:, None] + floor[:, None]
+
+
+# 장소별 계절성+공휴일 가법 성분 (P×N)
+def batch_additive(models: list, X: np.ndarray, additive: np.ndarray) -> np.ndarray:
+    beta = np.stack([_param(model, 'beta') for model in models]) * additive[None, :]
+    y_scale = np.array([model.y_scale for model in models])
+    return (X @ beta.T).T * y_scale[:, None]
+
+
+def _predict_one(model, ds: np.ndarray) -> pd.DataFrame:
+    samples = model.uncertainty_samples
+    model.uncertainty_samples = 0
+    try:
+        return model.predict(pd.DataFrame({'ds': ds}))[['ds', 'yhat']]
+    finally:
+        model.uncertainty_samples = samples
+
+
+# {장소: 모델}, {장소: 예측 시각} → {장소: DataFrame(ds, yhat)}
+def predict_batch(models: dict, ds_by_name: dict) -> dict:
+    results = {}
+    groups = {}
+    for name, model in models.items():
+        ds = np.asarray(ds_by_name[name], dtype='datetime64[ns]')
+        key = signature(model) if len(ds) else None
+        if not len(ds):
+            results[name] = pd.DataFrame({'ds': pd.to_datetime(ds), 'yhat': np.empty(0)})
+        elif key is None:
+            results[name] = _predict_one(model, ds)
+        else:
+            groups.setdefault(key, []).append((name, ds))
+
+    for members in groups.values():
+        group = [models[name] for name, _ in members]
+        grid = np.unique(np.concatenate([ds for _, ds in members]))
+        X, additive = design_matrix(group[0], grid)
+        if any(np.shape(model.params['beta'])[-1] != X.shape[1] for model in group):
+            for name, ds in members:
+                results[name] = _predict_one(models[name], ds)
+            continue
+        yhat = batch_trend(group, grid) + batch_additive(group, X, additive)
+        for i, (name, ds) in enumerate(members):
+            results[name] = pd.DataFrame({'ds': ds, 'yhat': yhat[i, np.searchsorted(grid, ds)]})
+    return {name: results[name] for name in models}
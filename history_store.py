@@ -0,0 +1,152 @@
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 장소별 학습 이력 로컬 컬럼 저장소 (memmap)
+# 경로: <root>/<key>/<장소>/{ds.bin, y.bin, meta.json}
+# - ds.bin: datetime64[s], y.bin: float64, 시간 오름차순으로 이어 붙임
+# - meta.json: rows(파일 행 수), offset(학습 기간 밖으로 밀려난 앞부분 행 수), watermark(마지막 시간),
+#   synced_at(호출하는 쪽이 넘긴 동기화 시각, 원본이 그 뒤에 과거 구간까지 바뀌었는지 확인용)
+# - 매일 watermark - rewind 이후 행만 fetch 로 다시 받아 꼬리를 교체, 기간 밖 행은 offset 으로 건너뛰고 절반 이상이면 파일 정리
+# - rewind 보다 더 과거에 늦게 바뀐 값은 반영하지 않음 (호출하는 쪽에서 확인 후 invalidate 로 다시 받음)
+DEFAULT_HISTORY_DIR = os.getenv('SDOT_HISTORY_DIR', '.cache/history')
+
+DS_DTYPE = np.dtype('datetime64[s]')
+Y_DTYPE = np.dtype('float64')
+FORMAT_VERSION = 2
+EMPTY_META = {'version': FORMAT_VERSION, 'rows': 0, 'offset': 0, 'watermark': None}
+
+
+class HistoryStore:
+    def __init__(self, root: str = DEFAULT_HISTORY_DIR):
+        self.root = root
+
+    def place_dir(self, key: str, name: str) -> str:
+        return os.path.join(self.root, key, str(name).replace(os.sep, '_').replace(' ', '_'))
+
+    def read_meta(self, key: str, name: str) -> dict:
+        path = os.path.join(self.place_dir(key, name), 'meta.json')
+        if not os.path.exists(path):
+            return dict(EMPTY_META)
+        with open(path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if meta.get('version') == FORMAT_VERSION else dict(EMPTY_META, stale=True)
+
+    def _write_meta(self, key: str, name: str, meta: dict) -> None:
+        path = os.path.join(self.place_dir(key, name), 'meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # meta 기준 행 수로 컬럼 파일 맞춤 (추가 도중 중단된 경우 꼬리 제거)
+    # 파일이 meta 보다 짧거나(정리 도중 중단) 형식이 다르면 장소를 비우고 다시 받음
+    def _check(self, key: str, name: str, meta: dict) -> dict:
+        base = self.place_dir(key, name)
+        paths = {col: os.path.join(base, f"{col}.bin") for col in ('ds', 'y')}
+        sizes = {col: os.path.getsize(path) if os.path.exists(path) else 0 for col, path in paths.items()}
+        rows = {'ds': sizes['ds'] // DS_DTYPE.itemsize, 'y': sizes['y'] // Y_DTYPE.itemsize}
+        if meta.get('stale') or min(rows.values()) < meta['rows']:
+            for path in paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            return dict(EMPTY_META)
+        for col, dtype in (('ds', DS_DTYPE), ('y', Y_DTYPE)):
+            if sizes[col] != meta['rows'] * dtype.itemsize:
+                os.truncate(paths[col], meta['rows'] * dtype.itemsize)
+        return meta
+
+    def _columns(self, key: str, name: str, meta: dict) -> tuple:
+        base = self.place_dir(key, name)
+        if not meta['rows']:
+            return np.empty(0, DS_DTYPE), np.empty(0, Y_DTYPE)
+        ds = np.memmap(os.path.join(base, 'ds.bin'), dtype=DS_DTYPE, mode='r', shape=(meta['rows'],))
+        y = np.memmap(os.path.join(base, 'y.bin'), dtype=Y_DTYPE, mode='r', shape=(meta['rows'],))
+        return ds[meta['offset']:], y[meta['offset']:]
+
+    # 장소 하나를 동기화: fetch(name, after, since) 로 since(학습 시작) 이후 & after 이후 행을 받아 추가
+    # watermark - rewind 이후의 저장분은 잘라내고 다시 받음 (아직 바뀔 수 있는 최근 구간), (추가 행, 버린 행) 반환
+    def sync(self, key: str, name: str, since: pd.Timestamp, fetch,
+             rewind: pd.Timedelta = pd.Timedelta(0), synced_at: Optional[str] = None) -> tuple:
+        base = self.place_dir(key, name)
+        os.makedirs(base, exist_ok=True)
+        meta = self._check(key, name, self.read_meta(key, name))
+        since = since.floor('s')
+
+        after = since - pd.Timedelta(seconds=1)
+        if meta['watermark']:
+            ds, _ = self._columns(key, name, {**meta, 'offset': 0})
+            keep = int(np.searchsorted(ds, np.datetime64((pd.Timestamp(meta['watermark']) - rewind).to_datetime64(), 's')))
+            if keep:
+                after = max(after, pd.Timestamp(ds[keep - 1]))
+            del ds
+            if keep < meta['rows']:
+                meta['rows'] = keep
+                meta['offset'] = min(meta['offset'], keep)
+                self._check(key, name, meta)
+
+        new = fetch(name, after, since)
+        appended = 0
+        if not new.empty:
+            new = new.sort_values('ds', kind='stable').drop_duplicates(subset=['ds'])
+            for col, values in (('ds', new['ds'].to_numpy(DS_DTYPE)), ('y', new['y'].to_numpy(Y_DTYPE))):
+                with open(os.path.join(base, f"{col}.bin"), 'ab') as f:
+                    f.write(values.tobytes())
+            appended = len(new)
+            meta['rows'] += appended
+        meta['watermark'] = None
+        if meta['rows']:
+            ds, _ = self._columns(key, name, {**meta, 'offset': 0})
+            meta['watermark'] = str(pd.Timestamp(ds[-1]))
+            del ds
+
+        # 학습 기간 밖 행은 offset 으로 건너뜀
+        ds, _ = self._columns(key, name, {**meta, 'offset': 0})
+        offset = int(np.searchsorted(ds, np.datetime64(since.to_datetime64(), 's')))
+        dropped = max(offset - meta['offset'], 0)
+        meta['offset'] = offset
+        del ds
+        if meta['offset'] and meta['offset'] * 2 >= meta['rows']:
+            self._compact(key, name, meta)
+        meta['synced_at'] = synced_at
+        self._write_meta(key, name, meta)
+        return appended, dropped
+
+    # 장소 이력을 비움 (다음 sync 에서 since 이후 전체를 다시 받음)
+    def invalidate(self, key: str, name: str) -> None:
+        if os.path.isdir(self.place_dir(key, name)):
+            self._write_meta(key, name, {**self.read_meta(key, name), 'stale': True})
+
+    # offset 앞부분을 잘라낸 파일로 교체
+    def _compact(self, key: str, name: str, meta: dict) -> None:
+        base = self.place_dir(key, name)
+        ds, y = self._columns(key, name, meta)
+        for col, values in (('ds', ds), ('y', y)):
+            path = os.path.join(base, f"{col}.bin")
+            with open(path + '.tmp', 'wb') as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+        del ds, y
+        for col in ('ds', 'y'):
+            path = os.path.join(base, f"{col}.bin")
+            os.replace(path + '.tmp', path)
+        meta['rows'] -= meta['offset']
+        meta['offset'] = 0
+
+    # 저장된 이력을 memmap 으로 읽어 since 이후 DataFrame(ds, y) 반환
+    def load(self, key: str, name: str, since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        meta = self.read_meta(key, name)
+        ds, y = self._columns(key, name, meta)
+        if since is not None:
+            start = int(np.searchsorted(ds, np.datetime64(since.floor('s').to_datetime64(), 's')))
+            ds, y = ds[start:], y[start:]
+        return pd.DataFrame({'ds': pd.to_datetime(ds.astype('datetime64[ns]')), 'y': np.asarray(y)})
+
+
+# SDOT_HISTORY_STORE=0 이면 None (DB 직접 조회)
+def default_store() -> Optional[HistoryStore]:
+    if os.getenv('SDOT_HISTORY_STORE', '1') == '0':
+        return None
+    return HistoryStore()
@@ -0,0 +1,114 @@
+import argparse
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import db
+import sdot_api
+from update_db import (
+    api_key, get_connection,
+    filter_parks_data, preprocess_park_data, save_to_park_db,
+    filter_mainstreet_data, preprocess_mainstreet_data, save_to_mainstreet_db
+)
+
+# 증분 수집: 테이블에 저장된 최신 measuring_time(워터마크) 이후 행만 가져와 저장
+# 10~60분 주기 실행용 (예: */15 * * * * python incremental.py)
+
+DB_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"      # 전처리 후 측정시간 형식
+FEED_TIME_FORMAT = "%Y-%m-%d_%H:%M:%S"    # API SENSING_TIME 형식
+
+
+# 워터마크 GROUP BY 를 인덱스만으로 처리하기 위한 (키, 측정시간) 복합 인덱스
+# main_street 는 rollup 과 같은 인덱스 (이름이 같으면 한 번만 생성)
+WATERMARK_INDEXES = {
+    'park': ('idx_park_district_dong_time', ['district', 'dong', 'measuring_time']),
+    'main_street': ('idx_serial_time', ['serial_no', 'measuring_time']),
+}
+
+
+# 워터마크 조회: 공원은 (구, 행정동), 메인거리는 시리얼번호 기준
+def load_watermarks() -> tuple:
+    db.ensure_indexes(WATERMARK_INDEXES)
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT district, dong, MAX(measuring_time) FROM park GROUP BY district, dong")
+    park_marks = {(district, dong): ts for district, dong, ts in cursor.fetchall() if ts}
+
+    cursor.execute("SELECT serial_no, MAX(measuring_time) FROM main_street GROUP BY serial_no")
+    main_marks = {str(serial): ts for serial, ts in cursor.fetchall() if ts}
+
+    cursor.close()
+    conn.close()
+    return park_marks, main_marks
+
+
+# 키별 워터마크보다 최신인 행만 남김 (워터마크 없는 새 센서는 floor 기준)
+def newer_than_watermark(df: pd.DataFrame, keys: pd.Series, marks: dict, floor: datetime) -> pd.DataFrame:
+    if df.empty:
+        return df
+    mark_str = {key: ts.strftime(DB_TIME_FORMAT) for key, ts in marks.items()}
+    thresholds = keys.map(mark_str).fillna(floor.strftime(DB_TIME_FORMAT))
+    return df[df['측정시간'] > thresholds].reset_index(drop=True)
+
+
+# 수집 시작 시각: 활성 키(가장 최신 워터마크에서 active_hours 이내) 중 가장 뒤처진 워터마크, 하한은 lookback_floor
+# 멈춘/철거된 센서나 예전 CSV 분기의 키 하나가 매번 이틀치 피드를 받게 만들지 않도록 그보다 오래된 워터마크는 무시
+# (다시 살아난 센서의 밀린 행은 floor 이후 분만 받고, 그 전 분은 일 단위 update_db 가 채움)
+def fetch_floor(marks: list, lookback_floor: datetime, active_hours: float) -> tuple:
+    if not marks:
+        return lookback_floor, 0
+    newest = max(marks)
+    active = [mark for mark in marks if mark >= newest - timedelta(hours=active_hours)]
+    return max(min(active), lookback_floor), len(marks) - len(active)
+
+
+def run_incremental(api_key: str, max_lookback_hours: float = 48, park: bool = True, mainstreet: bool = True,
+                    active_hours: float = 6) -> None:
+    park_marks, main_marks = load_watermarks()
+    marks = (list(park_marks.values()) if park else []) + (list(main_marks.values()) if mainstreet else [])
+
+    lookback_floor = datetime.now() - timedelta(hours=max_lookback_hours)
+    floor, silent = fetch_floor(marks, lookback_floor, active_hours)
+    if silent:
+        print(f"[INCREMENTAL] {active_hours:g}시간 넘게 새 행이 없는 키 {silent}개는 시작 시각 계산에서 제외")
+
+    # 15분 주기 수집은 매번 최신 피드를 그대로 받음 (페이지 캐시 기록/재생 안 함)
+    df_all = sdot_api.fetch_since(api_key, floor.strftime(FEED_TIME_FORMAT), cache=False, replay=False)
+    print(f"[INCREMENTAL] {floor:%Y-%m-%d %H:%M:%S} 이후 {len(df_all)}행 수집")
+    if df_all.empty:
+        return
+
+    if park:
+        df_park_raw = filter_parks_data(df_all)
+        if not df_park_raw.empty:
+            df_park = preprocess_park_data(df_park_raw)
+            keys = pd.Series(list(zip(df_park['구'], df_park['행정동'])), index=df_park.index)
+            df_park = newer_than_watermark(df_park, keys, park_marks, floor)
+            if not df_park.empty:
+                save_to_park_db(df_park)
+
+    if mainstreet:
+        df_main_raw = filter_mainstreet_data(df_all)
+        if not df_main_raw.empty:
+            df_main = preprocess_mainstreet_data(df_main_raw)
+            df_main = newer_than_watermark(df_main, df_main['시리얼번호'], main_marks, floor)
+            if not df_main.empty:
+                save_to_mainstreet_db(df_main)
+
+
+# 실행
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="S-DoT 워터마크 기반 증분 수집")
+    parser.add_argument('--max-lookback-hours', type=float, default=48, help="워터마크가 이보다 오래되면 이 시점부터만 수집")
+    parser.add_argument('--active-hours', type=float, default=6,
+                        help="가장 최신 워터마크보다 이만큼 넘게 뒤처진 키는 멈춘 센서로 보고 시작 시각 계산에서 제외")
+    parser.add_argument('--only', choices=['park', 'main_street'], help="한쪽 테이블만 수집")
+    args = parser.parse_args()
+
+    run_incremental(
+        api_key, args.max_lookback_hours,
+        park=args.only in (None, 'park'),
+        mainstreet=args.only in (None, 'main_street'),
+        active_hours=args.active_hours
+    )
@@ -1,17 +1,14 @@
-import os
+import sys
 
-PYTHON = "/home/ubuntu/sdot/venv/bin/python"
+import pipeline
 
-print("\n[1/4] 🔄 실시간 데이터 수집 및 DB 저장 중...")
-os.system(f"{PYTHON} update_db.py")
+# 수집 → 학습 → 예측 → 혼잡도 (한 프로세스에서 순서대로, 실패 시 후속 단계 중단)
+# 학습 단계의 spawn 프로세스 풀이 이 모듈을 다시 import 하므로 실행은 __main__ 에서만
+if __name__ == '__main__':
+    results = pipeline.run()
 
-print("\n[2/4] 🤖 Prophet 모델 학습 중...")
-os.system(f"{PYTHON} model.py")
-
-print("\n[3/4] 📈 예측값 생성 및 저장 중...")
-os.system(f"{PYTHON} predictor.py")
-
-print("\n[4/4] 📊 혼잡도 계산 및 저장 중...")
-os.system(f"{PYTHON} calculate_congestion.py")
-
-print("\n✅ 모든 작업 완료!")
+    if all(status == 'ok' for status, _ in results.values()):
+        print("\n✅ 모든 작업 완료!")
+    else:
+        print("\n❌ 실패한 단계가 있습니다.")
+        sys.exit(1)
@@ -1,47 +1,80 @@
 import pandas as pd
-import pymysql
+import db
+import history_store
+import model_store
+import rollup
 from prophet import Prophet
-import pickle
+import json
 import os
+import numpy as np
+import signal
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
 from dotenv import load_dotenv
-from typing import Tuple
+from typing import NamedTuple, Optional, Tuple
 
 # .env 파일 로드
 load_dotenv()
 
-# DB 연결
-def get_connection():
-    return pymysql.connect(
-        host=os.getenv('DB_HOST'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        db=os.getenv('DB_NAME'),
-        charset='utf8'
-    )
-
-# 공휴일 데이터 불러오기
-def load_holidays(filepath: str) -> Tuple[pd.DataFrame, set]:
+# 공휴일 데이터 불러오기 (Prophet 공휴일 표, 정렬된 공휴일 날짜 배열 datetime64[D])
+def load_holidays(filepath: str) -> Tuple[pd.DataFrame, np.ndarray]:
     holidays_df = pd.read_csv(filepath)
     holidays_df['ds'] = pd.to_datetime(holidays_df['date'])
-    holiday_dates = set(holidays_df['ds'].dt.date)
+    holiday_days = np.unique(holidays_df['ds'].to_numpy().astype('datetime64[D]'))
     holidays = holidays_df[['holiday', 'ds']].copy()
     holidays['lower_window'] = -1
     holidays['upper_window'] = 1
-    return holidays, holiday_dates
-
-# 데이터 불러오기
-def load_data_from_db(table: str, name_col: str) -> pd.DataFrame:
-    conn = get_connection()
-    query = f"""
-        SELECT measuring_time AS ds, visitor_count AS y, {name_col}
-        FROM {table}
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    df['ds'] = pd.to_datetime(df['ds'])
-    df = df.drop_duplicates(subset=['ds', name_col])
-    return df
+    return holidays, holiday_days
+
+# 학습에 쓰는 기간
+HISTORY_DAYS = 180
+
+# 장소별 학습 병렬 프로세스 수 / 학습 1건 제한 시간(초)
+FIT_WORKERS = int(os.getenv('MODEL_WORKERS', str(os.cpu_count() or 1)))
+FIT_TIMEOUT = int(os.getenv('MODEL_FIT_TIMEOUT', '1800'))
+
+# 이전 모델 파라미터로 초기값을 잡아 재학습 (MODEL_WARM_START=0 이면 항상 처음부터)
+WARM_START = os.getenv('MODEL_WARM_START', '1') != '0'
+
+# 로컬 이력에서 다시 받는 최근 구간 (늦게 들어온 행으로 바뀔 수 있는 시간별 집계)
+HISTORY_REWIND = pd.Timedelta(days=2)
+
+# 학습 시작 시각 (최근 HISTORY_DAYS 일)
+def history_cutoff() -> pd.Timestamp:
+    return pd.Timestamp.today() - pd.Timedelta(days=HISTORY_DAYS)
+
+# 장소 하나의 since 이후 시간별 평균 방문자수 (visitor_hourly, gap 시간 제외)
+def load_data_from_db(place_type: str, name: str, since: pd.Timestamp) -> pd.DataFrame:
+    return rollup.load_hourly(place_type, name, since - pd.Timedelta(seconds=1), since)
+
+# 장소 목록을 하나씩 읽어 (이름, DataFrame) 반환
+# store 가 있으면 로컬 이력에 새 시간만 받아 추가한 뒤 memmap 으로 읽음
+# 지난 동기화 뒤 rewind 구간보다 과거 시간이 다시 집계된 장소(CSV 적재, 집계 채움 등)는 이력을 비우고 전체를 다시 받음
+def iter_place_data(place_type: str, names: list, since: pd.Timestamp,
+                    store: Optional[history_store.HistoryStore] = None):
+    key = f"{rollup.ROLLUP_TABLE}/{place_type}"
+    if store is not None:
+        metas = {name: store.read_meta(key, name) for name in names}
+        marks = [meta['synced_at'] for meta in metas.values() if meta.get('synced_at')]
+        late = rollup.earliest_updated(place_type, names, pd.Timestamp(min(marks)).to_pydatetime()) if marks else {}
+
+    for name in names:
+        if store is None:
+            yield name, load_data_from_db(place_type, name, since)
+            continue
+        meta = metas[name]
+        if meta['watermark'] and (not meta.get('synced_at') or (
+                name in late and late[name] < pd.Timestamp(meta['watermark']) - HISTORY_REWIND)):
+            store.invalidate(key, name)
+            print(f"[HISTORY] {name}: 지난 동기화 뒤 과거 구간이 다시 집계되어 전체를 다시 받음")
+        synced_at = str(rollup.now_kst())
+        fetch = lambda place, after, start: rollup.load_hourly(place_type, place, after, start)
+        appended, dropped = store.sync(key, name, since, fetch, rewind=HISTORY_REWIND, synced_at=synced_at)
+        print(f"[HISTORY] {name}: +{appended}시간, 기간 밖 {dropped}시간 제외")
+        yield name, store.load(key, name, since)
 
 # Prophet 모델 생성
 def build_prophet_model(holidays: pd.DataFrame) -> Prophet:
@@ -56,55 +89,201 @@ def build_prophet_model(holidays: pd.DataFrame) -> Prophet:
     model.add_seasonality('weekly_custom', period=7, fourier_order=10)
     return model
 
-# 공휴일/주말 가중치
-def apply_holiday_weekend_weight(row, holiday_dates):
-    current_day = row['ds'].date()
-    if current_day in holiday_dates:
-        return row['y'] * 3.0
-    elif row['ds'].weekday() in [5, 6]:
-        return row['y'] * 1.5
-    else:
-        return row['y']
-
-# 모델 저장
-def save_model(model, filepath: str) -> None:
-    with open(filepath, 'wb') as f:
-        pickle.dump(model, f)
+# 장소 종류별 공휴일/주말 가중치 (공휴일이 주말보다 우선)
+HOLIDAY_WEEKEND_WEIGHTS = {
+    'park': {'holiday': 3.0, 'weekend': 1.5},
+    'main_street': {'holiday': 3.0, 'weekend': 1.5},
+}
+
+# ds 에 맞춘 가중치 배열: 기간 달력의 날짜별 가중치를 한 번 만들고 날짜 번호로 꺼냄
+def holiday_weekend_weights(ds, holiday_days: np.ndarray, weights: dict) -> np.ndarray:
+    days = np.asarray(ds, dtype='datetime64[ns]').astype('datetime64[D]')
+    if days.size == 0:
+        return np.ones(0)
+    first = days.min()
+    calendar = np.arange(first, days.max() + 1)
+    # 1970-01-01 이 목요일 → (일수 + 3) % 7 이 월=0 ... 일=6
+    weekday = (calendar.astype('int64') + 3) % 7
+    day_weights = np.where(weekday >= 5, weights['weekend'], 1.0)
+    day_weights[np.isin(calendar, holiday_days)] = weights['holiday']
+    return day_weights[(days - first).astype('int64')]
+
+# 학습 작업 하나 (로그 태그, 장소 이름, 학습 데이터, 모델 저장 디렉터리)
+class FitJob(NamedTuple):
+    tag: str
+    name: str
+    df: pd.DataFrame
+    path: str
+
+# 제한 시간을 넘기면 TimeoutError (SIGALRM, 작업 프로세스의 메인 스레드에서만 사용)
+@contextmanager
+def fit_timeout(seconds: int):
+    def _raise(signum, frame):
+        raise TimeoutError(f"{seconds}초 초과")
+    previous = signal.signal(signal.SIGALRM, _raise)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+# 이전 모델 불러오기 (LATEST 아티팩트, 없으면 이전 형식 pickle, 읽을 수 없으면 None)
+def load_previous_model(place_dir: str) -> Optional[Prophet]:
+    try:
+        return model_store.load_model(place_dir)
+    except Exception:
+        return None
+
+# 이전 모델 파라미터를 새 학습 데이터의 스케일(y_scale, start, t_scale)로 옮긴 초기값
+# 계절성/공휴일/변화점 구성이 다르면 None (cold start)
+def warm_start_init(prev: Prophet, probe: Prophet) -> Optional[dict]:
+    if (prev.params is None or prev.growth != 'linear' or probe.growth != 'linear'
+            or prev.seasonalities != probe.seasonalities
+            or list(prev.train_holiday_names) != list(probe.train_holiday_names)
+            or len(prev.changepoints_t) != len(probe.changepoints_t)
+            or prev.extra_regressors or probe.extra_regressors):
+        return None
+    params = {name: np.asarray(value).reshape(-1) for name, value in prev.params.items()}
+    if len(params['k']) != 1:
+        return None
+
+    # 이전 추세(구간별 기울기)를 새 변화점 위치에서 다시 읽어 새 스케일로 변환
+    prev_y_min = getattr(prev, 'y_min', 0.0) or 0.0
+    probe_y_min = getattr(probe, 'y_min', 0.0) or 0.0
+    ry = prev.y_scale / probe.y_scale
+    rt = probe.t_scale / prev.t_scale
+    k, m, delta = float(params['k'][0]), float(params['m'][0]), params['delta']
+    to_prev_t = lambda t_new: (probe.start + t_new * probe.t_scale - prev.start) / prev.t_scale
+    slope = lambda t_prev: k + delta[prev.changepoints_t <= t_prev].sum()
+
+    t0 = to_prev_t(0.0)
+    slopes = np.array([slope(t0)] + [slope(to_prev_t(cp)) for cp in probe.changepoints_t])
+    trend0 = Prophet.piecewise_linear(np.array([t0]), delta, k, m, prev.changepoints_t)[0]
+    return {
+        'k': slopes[0] * ry * rt,
+        'm': (trend0 * prev.y_scale + prev_y_min - probe_y_min) / probe.y_scale,
+        'delta': np.diff(slopes) * ry * rt,
+        'beta': params['beta'] * ry,
+        'sigma_obs': float(params['sigma_obs'][0]) * ry,
+    }
+
+# 학습 통계 사이드카 (모델 파일 옆 .fitstats.json), cold start 기록은 기준값으로 유지
+def fit_stats_path(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + '.fitstats.json'
+
+def load_fit_stats(model_path: str) -> dict:
+    path = fit_stats_path(model_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_fit_stats(model_path: str, stats: dict) -> None:
+    path = fit_stats_path(model_path)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+# 작업 프로세스에서 학습 + 저장, 학습 통계 반환
+def fit_and_save(job: FitJob, holidays: pd.DataFrame, timeout: int, warm_start: bool = WARM_START) -> dict:
+    started = time.perf_counter()
+    with fit_timeout(timeout):
+        init = None
+        prev = load_previous_model(job.path) if warm_start else None
+        if prev is not None:
+            # 같은 설정의 빈 모델로 새 데이터의 스케일/공휴일 구성만 계산
+            probe = build_prophet_model(holidays)
+            probe.preprocess(job.df)
+            init = warm_start_init(prev, probe)
+
+        model = build_prophet_model(holidays)
+        if init is not None:
+            model.fit(job.df, init=init, save_iterations=True)
+        else:
+            model.fit(job.df, save_iterations=True)
+
+    stats = load_fit_stats(job.path)
+    try:
+        iterations = len(model.stan_fit.optimized_iterations_np)
+    except Exception:
+        iterations = None
+    current = {'mode': 'warm' if init is not None else 'cold', 'iterations': iterations,
+               'seconds': round(time.perf_counter() - started, 3), 'fitted_at': datetime.now().isoformat(timespec='seconds')}
+    current['version'] = model_store.save_artifact(job.path, model, {
+        'name': job.name,
+        'training_window': model_store.training_window(job.df),
+        'data_hash': model_store.data_hash(job.df),
+        'fit': dict(current),
+    })
+    stats['last'] = current
+    if init is None:
+        stats['cold'] = current
+    save_fit_stats(job.path, stats)
+    return stats
+
+# 학습 통계 한 줄 요약 (warm start 면 최근 cold start 대비 절약분)
+def describe_fit(stats: dict) -> str:
+    last, cold = stats['last'], stats.get('cold')
+    text = f"{last.get('version')}, {last['mode']}, {last['iterations']} iter, {last['seconds']:.1f}s"
+    if last['mode'] == 'warm' and cold and cold['iterations'] is not None and last['iterations'] is not None:
+        text += f", cold 대비 {cold['iterations'] - last['iterations']} iter / {cold['seconds'] - last['seconds']:.1f}s 절약"
+    return text
+
+# 작업들을 프로세스 풀에서 학습 (한 장소 실패가 다른 장소에 영향 없음), {장소: 소요 시간 또는 예외} 반환
+def train_all(jobs: list, holidays: pd.DataFrame, workers: int = FIT_WORKERS, timeout: int = FIT_TIMEOUT) -> dict:
+    if not jobs:
+        return {}
+    results = {}
+    started = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs))), mp_context=context) as pool:
+        futures = {pool.submit(fit_and_save, job, holidays, timeout): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                stats = future.result()
+                results[job.name] = stats['last']['seconds']
+                print(f"[{job.tag}] {job.name} 모델 저장 완료 ({describe_fit(stats)})")
+            except Exception as e:
+                results[job.name] = e
+                print(f"[{job.tag}] {job.name} 학습 실패: {e!r}")
+
+    wall = time.perf_counter() - started
+    fit_total = sum(value for value in results.values() if isinstance(value, float))
+    failed = sum(isinstance(value, Exception) for value in results.values())
+    print(f"[MODEL] {len(jobs)}건 학습 (실패 {failed}), 벽시계 {wall:.1f}s, 작업 시간 합계 {fit_total:.1f}s, 병렬 효과 x{fit_total / max(wall, 1e-9):.1f}")
+    return results
+
+# 학습 데이터 준비 (장소 종류별 공휴일/주말 가중치 적용)
+def prepare_training_frame(df_one: pd.DataFrame, holiday_days: np.ndarray, place_type: str) -> pd.DataFrame:
+    df_prophet = df_one[['ds', 'y']].copy()
+    weights = holiday_weekend_weights(df_prophet['ds'], holiday_days, HOLIDAY_WEEKEND_WEIGHTS[place_type])
+    df_prophet['y'] = df_prophet['y'].to_numpy(dtype=float) * weights
+    return df_prophet
 
 # 실행
 def main():
     holiday_data_path = 'dataset/kr_holidays_2023_2025.csv'
-    holidays, holiday_dates = load_holidays(holiday_data_path)
+    holidays, holiday_days = load_holidays(holiday_data_path)
 
     # 공원 처리
     park_list = ['암사생태공원', '서울숲공원', '서대문독립공원', '북서울꿈의숲', '은평평화공원']
-    df_park = load_data_from_db('park', 'park_name')
+    cutoff_date = history_cutoff()
+    store = history_store.default_store()
+    jobs = []
 
     os.makedirs('models', exist_ok=True)
 
-    for park in park_list:
-        df_one = df_park[df_park['park_name'] == park]
+    # 학습 기간 중 집계가 덮지 못한 원본 구간을 먼저 채움 (첫 배포, 집계를 거치지 않은 적재)
+    rollup.ensure_coverage('park', park_list, cutoff_date)
+    for park, df_one in iter_place_data('park', park_list, cutoff_date, store):
         if df_one.empty:
             print(f"[{park}] 데이터 없음, 스킵")
             continue
 
-        ## 추가
-        # 최근 180일만 사용
-        cutoff_date = pd.Timestamp.today() - pd.Timedelta(days=180)
-        df_one = df_one[df_one['ds'] >= cutoff_date]
-
-        df_prophet = df_one[['ds', 'y']].copy()
-
-        df_prophet['y'] = df_prophet.apply(apply_holiday_weekend_weight, axis=1, holiday_dates=holiday_dates)
-
-
-
-        model = build_prophet_model(holidays)
-        model.fit(df_prophet)
-
-        model_path = os.path.join('models', f"{park.replace(' ', '_')}.pkl")
-        save_model(model, model_path)
-        print(f"[PARK] {park} 모델 저장 완료")
+        model_path = os.path.join('models', park.replace(' ', '_'))
+        jobs.append(FitJob('PARK', park, prepare_training_frame(df_one, holiday_days, 'park'), model_path))
 
     # 거리 처리
     main_street_map = {
@@ -112,30 +291,24 @@ def main():
         '4020': '이태원회나무길'
     }
     serial_list = list(main_street_map.keys())
-    df_street = load_data_from_db('main_street', 'serial_no')
 
     os.makedirs('models_mainstreet', exist_ok=True)
 
-    for serial in serial_list:
-        df_one = df_street[df_street['serial_no'] == serial]
+    rollup.ensure_coverage('main_street', serial_list, cutoff_date)
+    for serial, df_one in iter_place_data('main_street', serial_list, cutoff_date, store):
         if df_one.empty:
             print(f"[{serial}] 거리 데이터 없음, 스킵")
             continue
-                ## 추가
-        # 최근 180일만 사용
-        cutoff_date = pd.Timestamp.today() - pd.Timedelta(days=180)
-        df_one = df_one[df_one['ds'] >= cutoff_date]
-
-        df_prophet = df_one[['ds', 'y']].copy()
-        df_prophet['y'] = df_prophet.apply(apply_holiday_weekend_weight, axis=1, holiday_dates=holiday_dates)
-
-        model = build_prophet_model(holidays)
-        model.fit(df_prophet)
 
         street_name = main_street_map.get(serial, f"unknown_{serial}")
-        model_path = os.path.join('models_mainstreet', f"{street_name}.pkl")
-        save_model(model, model_path)
-        print(f"[STREET] {street_name} 모델 저장 완료")
+        model_path = os.path.join('models_mainstreet', street_name)
+        jobs.append(FitJob('STREET', street_name, prepare_training_frame(df_one, holiday_days, 'main_street'), model_path))
+
+    # 장소별 학습을 병렬로 (일부 실패는 기존 모델 유지, 전부 실패하면 단계 실패)
+    results = train_all(jobs, holidays)
+    if results and all(isinstance(value, Exception) for value in results.values()):
+        raise RuntimeError("모든 장소 학습 실패")
 
 if __name__ == '__main__':
     main()
+    db.report()
@@ -0,0 +1,273 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet, __version__ as PROPHET_VERSION
+from prophet.serialize import SIMPLE_ATTRIBUTES
+
+# 예측용 모델 아티팩트 저장소 (Prophet 객체 전체 pickle 대신)
+# 경로: <장소 디렉터리>/<버전>/{model.json, manifest.json}, <장소 디렉터리>/LATEST (현재 버전 이름)
+# - model.json: 학습된 파라미터(학습 구간 trend 제외), 계절성/공휴일 구성, 스케일 상수, 이력 마지막 HISTORY_TAIL 구간
+# - manifest.json: 형식 버전, 학습 기간, 학습 데이터 해시, 학습 시각, 학습 통계
+# - 새 버전은 임시 디렉터리에 다 쓴 뒤 이름을 바꾸고 LATEST 를 os.replace 로 교체 (중간에 중단돼도 이전 버전 유지)
+# - LATEST 가 없으면 같은 이름의 .pkl (이전 형식) 을 읽음
+FORMAT_VERSION = 1
+LATEST_FILE = 'LATEST'
+KEEP_VERSIONS = int(os.getenv('MODEL_KEEP_VERSIONS', '5'))
+
+# predict 는 history 가 있어야 하고 make_future_dataframe 은 마지막 이력 시각부터 이어 붙이므로 꼬리만 남김
+# (예측 저장 구간이 KST 변환으로 이력 마지막 9시간을 포함하므로 그보다 길게)
+HISTORY_TAIL = pd.Timedelta(hours=24)
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def legacy_path(place_dir: str) -> str:
+    return place_dir + '.pkl'
+
+
+# 학습 데이터 (ds, y) 해시
+def data_hash(df: pd.DataFrame) -> str:
+    hashed = pd.util.hash_pandas_object(df[['ds', 'y']], index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+
+# 학습 기간 (처음/마지막 시각, 행 수)
+def training_window(df: pd.DataFrame) -> dict:
+    return {'start': str(df['ds'].min()), 'end': str(df['ds'].max()), 'rows': int(len(df))}
+
+
+def _times(values) -> list:
+    return pd.DatetimeIndex(values).strftime(TIME_FORMAT).tolist()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON 변환 불가: {type(value)}")
+
+
+def _frame_to_columns(df: pd.DataFrame) -> dict:
+    return {col: _times(df[col]) if col == 'ds' else df[col].tolist() for col in df.columns}
+
+
+def _columns_to_frame(columns: dict) -> pd.DataFrame:
+    df = pd.DataFrame(columns)
+    if 'ds' in df:
+        df['ds'] = pd.to_datetime(df['ds'], format=TIME_FORMAT)
+    return df
+
+
+# 학습된 Prophet 모델 → 추론에 필요한 값만 담은 dict
+def to_artifact(model: Prophet) -> dict:
+    if model.history is None or model.params is None:
+        raise ValueError("학습되지 않은 모델")
+    cols = model.train_component_cols
+    tail_start = model.history_dates.max() - HISTORY_TAIL
+    regressors = OrderedDict((name, {**props, 'predictor': None}) for name, props in model.extra_regressors.items())
+    return {
+        'format': FORMAT_VERSION,
+        'attributes': {attr: getattr(model, attr) for attr in SIMPLE_ATTRIBUTES if hasattr(model, attr)},
+        'start': model.start.strftime(TIME_FORMAT),
+        't_scale': model.t_scale.total_seconds(),
+        'changepoints': _times(model.changepoints),
+        'changepoints_t': np.asarray(model.changepoints_t).tolist(),
+        'seasonalities': [list(model.seasonalities), dict(model.seasonalities)],
+        'extra_regressors': [list(regressors), dict(regressors)],
+        'holidays': None if model.holidays is None else _frame_to_columns(model.holidays),
+        'train_holiday_names': None if model.train_holiday_names is None else list(model.train_holiday_names),
+        # 성분별 0/1 행렬은 1 인 행 번호만
+        'component_cols': {
+            'columns': list(cols.columns),
+            'rows': len(cols),
+            'nonzero': {col: np.flatnonzero(cols[col].to_numpy()).tolist() for col in cols.columns},
+        },
+        'history': _frame_to_columns(model.history[model.history['ds'] >= tail_start]),
+        'history_dates': _times(model.history_dates[model.history_dates >= tail_start]),
+        'params': {name: np.asarray(value).tolist() for name, value in model.params.items() if name != 'trend'},
+    }
+
+
+# to_artifact 결과 → 예측 가능한 Prophet 모델
+def from_artifact(data: dict) -> Prophet:
+    if data.get('format') != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 아티팩트 형식: {data.get('format')}")
+    model = Prophet()
+    for attr, value in data['attributes'].items():
+        setattr(model, attr, value)
+    model.start = pd.Timestamp(data['start'])
+    model.t_scale = pd.Timedelta(seconds=data['t_scale'])
+    model.changepoints = pd.Series(pd.to_datetime(data['changepoints'], format=TIME_FORMAT), name='ds')
+    model.changepoints_t = np.array(data['changepoints_t'])
+    model.seasonalities = OrderedDict((name, data['seasonalities'][1][name]) for name in data['seasonalities'][0])
+    model.extra_regressors = OrderedDict((name, data['extra_regressors'][1][name]) for name in data['extra_regressors'][0])
+    model.holidays = None if data['holidays'] is None else _columns_to_frame(data['holidays'])
+    names = data['train_holiday_names']
+    model.train_holiday_names = None if names is None else pd.Series(names)
+
+    cols = data['component_cols']
+    matrix = np.zeros((cols['rows'], len(cols['columns'])), dtype='int64')
+    for j, col in enumerate(cols['columns']):
+        matrix[cols['nonzero'][col], j] = 1
+    model.train_component_cols = pd.DataFrame(
+        matrix, index=pd.RangeIndex(cols['rows'], name='col'), columns=pd.Index(cols['columns'], name='component')
+    )
+
+    model.history = _columns_to_frame(data['history'])
+    model.history_dates = pd.Series(pd.to_datetime(data['history_dates'], format=TIME_FORMAT), name='ds')
+    model.params = {name: np.array(value) for name, value in data['params'].items()}
+    model.fit_kwargs = {}
+    model.stan_fit = None
+    return model
+
+
+def latest_version(place_dir: str) -> Optional[str]:
+    path = os.path.join(place_dir, LATEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read().strip() or None
+
+
+# 저장된 버전 목록 (오래된 순)
+def list_versions(place_dir: str) -> list:
+    if not os.path.isdir(place_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(place_dir)
+        if not name.startswith('.') and os.path.exists(os.path.join(place_dir, name, 'manifest.json'))
+    )
+
+
+# LATEST 를 version 으로 교체
+def set_latest(place_dir: str, version: str) -> None:
+    if not os.path.exists(os.path.join(place_dir, version, 'manifest.json')):
+        raise ValueError(f"없는 버전: {version}")
+    path = os.path.join(place_dir, LATEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(path + '.tmp', path)
+
+
+def read_manifest(place_dir: str, version: Optional[str] = None) -> dict:
+    version = version or latest_version(place_dir)
+    with open(os.path.join(place_dir, version, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 새 버전으로 저장하고 LATEST 로 지정, 버전 이름 반환
+def save_artifact(place_dir: str, model: Prophet, manifest: dict, keep: int = KEEP_VERSIONS) -> str:
+    os.makedirs(place_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    version, n = stamp, 0
+    while os.path.exists(os.path.join(place_dir, version)):
+        n += 1
+        version = f"{stamp}-{n}"
+
+    tmp_dir = os.path.join(place_dir, f".{version}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    with open(os.path.join(tmp_dir, 'model.json'), 'w', encoding='utf-8') as f:
+        json.dump(to_artifact(model), f, ensure_ascii=False, default=_json_default)
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'format': FORMAT_VERSION, 'version': version, 'prophet_version': PROPHET_VERSION,
+                   'created_at': datetime.now().isoformat(timespec='seconds'), **manifest},
+                  f, ensure_ascii=False, indent=2, default=_json_default)
+    os.replace(tmp_dir, os.path.join(place_dir, version))
+    set_latest(place_dir, version)
+    prune(place_dir, keep)
+    return version
+
+
+def load_artifact(place_dir: str, version: Optional[str] = None) -> Prophet:
+    version = version or latest_version(place_dir)
+    if version is None:
+        raise FileNotFoundError(f"{place_dir}: 저장된 버전 없음")
+    with open(os.path.join(place_dir, version, 'model.json'), encoding='utf-8') as f:
+        return from_artifact(json.load(f))
+
+
+# 현재 버전이 있으면 아티팩트, 없으면 이전 형식 pickle, 둘 다 없으면 None
+def load_model(place_dir: str) -> Optional[Prophet]:
+    if latest_version(place_dir) is not None:
+        return load_artifact(place_dir)
+    if os.path.exists(legacy_path(place_dir)):
+        with open(legacy_path(place_dir), 'rb') as f:
+            return pickle.load(f)
+    return None
+
+
+# LATEST 를 현재 바로 이전 버전으로 되돌림, 되돌린 버전 반환
+def rollback(place_dir: str) -> str:
+    current = latest_version(place_dir)
+    older = [version for version in list_versions(place_dir) if current is None or version < current]
+    if not older:
+        raise ValueError(f"{place_dir}: 되돌릴 이전 버전 없음")
+    set_latest(place_dir, older[-1])
+    return older[-1]
+
+
+# 오래된 버전부터 지워 keep 개만 남김 (LATEST 가 가리키는 버전은 유지)
+def prune(place_dir: str, keep: int = KEEP_VERSIONS) -> list:
+    current = latest_version(place_dir)
+    versions = list_versions(place_dir)
+    removed = []
+    for version in versions[:max(len(versions) - keep, 0)]:
+        if version != current:
+            shutil.rmtree(os.path.join(place_dir, version))
+            removed.append(version)
+    return removed
+
+
+# 이전 형식 pickle 을 아티팩트로 변환 (학습 기간/해시는 pickle 안의 이력 기준)
+def import_legacy(place_dir: str) -> str:
+    with open(legacy_path(place_dir), 'rb') as f:
+        model = pickle.load(f)
+    fitted_at = datetime.fromtimestamp(os.path.getmtime(legacy_path(place_dir))).isoformat(timespec='seconds')
+    manifest = {
+        'training_window': training_window(model.history),
+        'data_hash': data_hash(model.history),
+        'fit': {'mode': 'legacy', 'fitted_at': fitted_at},
+    }
+    return save_artifact(place_dir, model, manifest)
+
+
+def _size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+# 실행
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="모델 아티팩트 버전 관리")
+    parser.add_argument('place_dir', help="장소 디렉터리 (예: models_mainstreet/샤로수길)")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--rollback', action='store_true', help="LATEST 를 이전 버전으로")
+    action.add_argument('--promote', metavar='VERSION', help="LATEST 를 지정한 버전으로")
+    action.add_argument('--import-legacy', action='store_true', help="같은 이름의 .pkl 을 새 버전으로 변환")
+    args = parser.parse_args()
+
+    if args.rollback:
+        print(f"✅ {args.place_dir} → {rollback(args.place_dir)}")
+    elif args.promote:
+        set_latest(args.place_dir, args.promote)
+        print(f"✅ {args.place_dir} → {args.promote}")
+    elif args.import_legacy:
+        print(f"✅ {args.place_dir} → {import_legacy(args.place_dir)}")
+
+    current = latest_version(args.place_dir)
+    for version in list_versions(args.place_dir):
+        manifest = read_manifest(args.place_dir, version)
+        window = manifest.get('training_window', {})
+        marker = '*' if version == current else ' '
+        print(f"{marker} {version}  {window.get('start')} ~ {window.get('end')} ({window.get('rows')}행)  "
+              f"{manifest.get('data_hash', '')[:12]}  {_size(os.path.join(args.place_dir, version)) / 1024:.1f}KB")
@@ -0,0 +1,105 @@
+import gzip
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+# S-DoT API 원본 응답 기록/재생 (gzip)
+# 경로: <root>/<dataset>/<스냅샷>/<start>_<end>.xml.gz, 스냅샷 = 수집 시작 시각 (실행마다 하나)
+# 행 번호는 그 스냅샷의 피드 기준이므로 live 수집은 기록만 하고 읽지 않음
+# 읽기는 replay(재실행/디버깅/벤치마크)에서 한 스냅샷 안에서만
+DEFAULT_CACHE_DIR = os.getenv('SDOT_CACHE_DIR', '.cache/sdot')
+DEFAULT_TTL_HOURS = float(os.getenv('SDOT_CACHE_TTL_HOURS', '12'))
+DEFAULT_MAX_MB = float(os.getenv('SDOT_CACHE_MAX_MB', '512'))
+
+
+class CacheMiss(KeyError):
+    pass
+
+
+class PageCache:
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, ttl_hours: float = DEFAULT_TTL_HOURS,
+                 max_mb: float = DEFAULT_MAX_MB):
+        self.root = root
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 2**20)
+
+    def path(self, dataset: str, start: int, end: int, snapshot: str) -> str:
+        return os.path.join(self.root, dataset, snapshot, f"{start}_{end}.xml.gz")
+
+    # prefix(날짜 또는 스냅샷 이름 앞부분)로 시작하는 가장 최근 스냅샷 (replay 기본값)
+    def latest_snapshot(self, dataset: str, prefix: Optional[str] = None) -> Optional[str]:
+        base = os.path.join(self.root, dataset)
+        if not os.path.isdir(base):
+            return None
+        snapshots = sorted(d for d in os.listdir(base)
+                           if os.path.isdir(os.path.join(base, d)) and d.startswith(prefix or ''))
+        return snapshots[-1] if snapshots else None
+
+    # 기록된 페이지 조회 (replay 전용, TTL 무시)
+    def get(self, dataset: str, start: int, end: int, snapshot: str) -> Optional[bytes]:
+        path = self.path(dataset, start, end, snapshot)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        with gzip.open(path, 'rb') as f:
+            content = f.read()
+        # atime = 마지막 사용 시각 (용량 초과 시 LRU 기준), mtime = 저장 시각 (TTL 기준)
+        os.utime(path, (time.time(), stat.st_mtime))
+        return content
+
+    def put(self, dataset: str, start: int, end: int, content: bytes, snapshot: str) -> None:
+        path = self.path(dataset, start, end, snapshot)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=6))
+        os.replace(tmp_path, path)
+
+    # TTL 만료분 삭제 후, 용량 초과 시 오래 안 쓴 페이지부터 삭제
+    def evict(self) -> int:
+        now = time.time()
+        entries = []
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.ttl:
+                    os.remove(path)
+                    removed += 1
+                else:
+                    entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+
+        for dirpath, dirnames, filenames in os.walk(self.root, topdown=False):
+            if dirpath != self.root and not dirnames and not filenames:
+                os.rmdir(dirpath)
+        return removed
+
+
+# 새 스냅샷 이름 (수집 시작 시각, 이름순 = 시간순)
+def snapshot_id() -> str:
+    return datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')
+
+
+# 환경변수 기반 기본 캐시 (SDOT_CACHE=0 이면 기록 안 함)
+def default_cache() -> Optional[PageCache]:
+    if os.getenv('SDOT_CACHE', '1') == '0':
+        return None
+    return PageCache()
+
+
+def replay_enabled() -> bool:
+    return os.getenv('SDOT_REPLAY', '0') == '1'
@@ -0,0 +1,124 @@
+import argparse
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple, Optional
+
+import db
+
+# 야간 파이프라인: 단계를 한 프로세스 안에서 함수로 실행
+# - 단계 간 의존성을 선언하고, 선행 단계가 실패하면 후속 단계는 건너뜀
+# - 의존성이 없는 단계끼리는 workers 만큼 동시에 실행
+# - 단계별 소요 시간 리포트 출력, 단계별 (상태, 소요 시간) 반환
+
+
+class Stage(NamedTuple):
+    name: str
+    label: str
+    run: Callable[[], None]
+    deps: tuple = ()
+
+
+def _update_db():
+    import update_db
+    update_db.main()
+
+
+def _train():
+    import model
+    model.main()
+
+
+def _predict():
+    import predictor
+    predictor.main()
+
+
+# 예측 단계가 혼잡도까지 저장하므로 기본 단계에는 없음 (저장된 예측으로 다시 계산할 때 --only congestion)
+def _congestion():
+    import calculate_congestion
+    calculate_congestion.main()
+
+
+STAGES = [
+    Stage('update_db', "🔄 실시간 데이터 수집 및 DB 저장", _update_db),
+    Stage('model', "🤖 Prophet 모델 학습", _train, ('update_db',)),
+    Stage('predictor', "📈 예측값 + 혼잡도 생성 및 저장", _predict, ('model',)),
+]
+RECOMPUTE_STAGES = [
+    Stage('congestion', "📊 저장된 예측으로 혼잡도 재계산 및 저장", _congestion, ('predictor',)),
+]
+
+
+def _run_stage(stage: Stage) -> tuple:
+    started = time.perf_counter()
+    try:
+        stage.run()
+        return 'ok', time.perf_counter() - started, None
+    except Exception:
+        return 'failed', time.perf_counter() - started, traceback.format_exc()
+
+
+# stages 를 의존성 순서대로 실행, {단계: (상태, 소요 시간)} 반환
+# only 가 주어지면 해당 단계만 실행 (선택되지 않은 선행 단계는 완료된 것으로 간주)
+def run(stages: list = STAGES, only: Optional[list] = None, workers: int = 1) -> dict:
+    selected = [stage for stage in stages if only is None or stage.name in only]
+    names = {stage.name for stage in selected}
+    unknown = [dep for stage in selected for dep in stage.deps if dep not in {s.name for s in stages}]
+    if unknown:
+        raise ValueError(f"알 수 없는 선행 단계: {unknown}")
+
+    started = time.perf_counter()
+    results = {}
+    pending = list(selected)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            progressed = False
+            for stage in list(pending):
+                deps = [dep for dep in stage.deps if dep in names]
+                if any(results.get(dep, ('',))[0] in ('failed', 'skipped') for dep in deps):
+                    pending.remove(stage)
+                    progressed = True
+                    results[stage.name] = ('skipped', 0.0)
+                    print(f"\n[{stage.name}] ⏭ 선행 단계 실패로 건너뜀")
+                elif all(results.get(dep, ('',))[0] == 'ok' for dep in deps) and len(running) < workers:
+                    pending.remove(stage)
+                    progressed = True
+                    position = [s.name for s in selected].index(stage.name) + 1
+                    print(f"\n[{position}/{len(selected)}] {stage.label} 중...")
+                    running[pool.submit(_run_stage, stage)] = stage
+            if not running:
+                if not progressed:
+                    raise ValueError(f"순환 의존성: {[stage.name for stage in pending]}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                status, elapsed, error = future.result()
+                results[stage.name] = (status, elapsed)
+                if error:
+                    print(f"\n[{stage.name}] ❌ 실패 ({elapsed:.1f}s)\n{error}")
+
+    report(results, time.perf_counter() - started)
+    return results
+
+
+def report(results: dict, wall: float) -> None:
+    print("\n[PIPELINE] 단계별 소요 시간")
+    for name, (status, elapsed) in results.items():
+        print(f"  {name:<12} {status:<8} {elapsed:8.1f}s")
+    print(f"  {'total':<12} {'':<8} {wall:8.1f}s")
+    db.report()
+
+
+# 실행
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="야간 파이프라인 실행")
+    parser.add_argument('--only', nargs='+', choices=[stage.name for stage in STAGES + RECOMPUTE_STAGES],
+                        help="지정한 단계만 실행")
+    parser.add_argument('--workers', type=int, default=1, help="의존성 없는 단계 동시 실행 수")
+    args = parser.parse_args()
+
+    results = run(STAGES + RECOMPUTE_STAGES if args.only else STAGES, only=args.only, workers=args.workers)
+    raise SystemExit(0 if all(status == 'ok' for status, _ in results.values()) else 1)
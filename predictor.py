@@ -1,66 +1,112 @@
+import numpy as np
 import pandas as pd
-import pickle
 import os
-import pymysql
-import pytz
+import calculate_congestion
+import db
+import delta_writer
+import forecast_engine
+import model_store
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
-# DB 연결
-def get_connection():
-    return pymysql.connect(
-        host=os.getenv('DB_HOST'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        db=os.getenv('DB_NAME'),
-        charset='utf8'
-    )
-
-# 모델 불러오기
-def load_model(filepath: str):
-    with open(filepath, 'rb') as f:
-        return pickle.load(f)
-
-# 예측 결과 저장
-def save_forecast_to_db(name: str, place_type: str, forecast_df: pd.DataFrame, start_date: str, end_date: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    forecast_df['ds'] = forecast_df['ds'].dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
-    forecast_df['date'] = forecast_df['ds'].dt.date
-    forecast_df['hour'] = forecast_df['ds'].dt.hour
-
+# 모델 불러오기 (LATEST 아티팩트, 없으면 이전 형식 .pkl, 둘 다 없으면 None)
+def load_model(place_dir: str):
+    return model_store.load_model(place_dir)
+
+# 마지막 이력 다음 시간부터 예측하는 시간 수
+FORECAST_PERIODS = 9 * 24
+
+# 저장하는 구간만 불확실성 샘플링 없이 예측 (PREDICT_FAST=0 이면 이력 전체 + 샘플링)
+FAST_FORECAST = os.getenv('PREDICT_FAST', '1') != '0'
+
+# 저장 구간(ds 를 UTC 로 보고 KST 변환한 날짜 start~end)을 ds 기준 [lower, upper) 로
+def stored_bounds(start_date: str, end_date: str) -> tuple:
+    to_utc = lambda day: pd.Timestamp(day).tz_localize('Asia/Seoul').tz_convert('UTC').tz_localize(None)
+    return to_utc(start_date).to_datetime64(), to_utc(pd.Timestamp(end_date) + pd.Timedelta(days=1)).to_datetime64()
+
+# make_future_dataframe(이력 + 미래 periods 시간) 시각 중 저장 구간에 드는 시각만
+# KST 변환 때문에 이력 마지막 9시간이 내일 날짜로 저장되므로 그 이력 시각도 포함
+def horizon_ds(model, bounds: tuple, periods: int = FORECAST_PERIODS) -> np.ndarray:
+    lower, upper = bounds
+    history = model.history_dates.to_numpy()
+    future = history[-1] + np.arange(1, periods + 1) * np.timedelta64(1, 'h')
+    ds = np.concatenate([history[np.searchsorted(history, lower):], future])
+    return ds[(ds >= lower) & (ds < upper)]
+
+def forecast_horizon(model, start_date: str, end_date: str, periods: int = FORECAST_PERIODS) -> pd.DataFrame:
+    return pd.DataFrame({'ds': horizon_ds(model, stored_bounds(start_date, end_date), periods)})
+
+# 예측 엔진 (batch: 같은 구성의 모델을 한 번에 행렬 계산, prophet: 장소별 model.predict)
+FORECAST_ENGINE = os.getenv('PREDICT_ENGINE', 'batch')
+
+# 예측 (yhat 은 0 미만 제거), fast 면 저장 구간의 ds, yhat 만 반환
+def forecast(model, start_date: str, end_date: str, fast: bool = FAST_FORECAST) -> pd.DataFrame:
+    if not fast:
+        result = model.predict(model.make_future_dataframe(periods=FORECAST_PERIODS, freq='h'))
+    else:
+        future = forecast_horizon(model, start_date, end_date)
+        if future.empty:
+            return pd.DataFrame({'ds': future['ds'], 'yhat': pd.Series(dtype=float)})
+        samples = model.uncertainty_samples
+        model.uncertainty_samples = 0
+        try:
+            result = model.predict(future)[['ds', 'yhat']]
+        finally:
+            model.uncertainty_samples = samples
+    result['yhat'] = result['yhat'].clip(lower=0)
+    return result
+
+# {장소: 모델} 전체 예측, {장소: DataFrame(ds, yhat)} 반환
+def forecast_all(models: dict, start_date: str, end_date: str) -> dict:
+    if not FAST_FORECAST or FORECAST_ENGINE != 'batch':
+        return {name: forecast(model, start_date, end_date) for name, model in models.items()}
+    bounds = stored_bounds(start_date, end_date)
+    horizons = {name: horizon_ds(model, bounds) for name, model in models.items()}
+    results = forecast_engine.predict_batch(models, horizons)
+    for result in results.values():
+        result['yhat'] = result['yhat'].clip(lower=0)
+    return results
+
+# forecast upsert 키 / 비교 컬럼 / 값이 바뀐 행에서 갱신하는 컬럼
+FORECAST_KEYS = ['name', 'type', 'forecast_date', 'forecast_hour']
+FORECAST_UPSERT_UPDATE = "yhat = VALUES(yhat), updated_at = VALUES(updated_at)"
+
+# 예측 결과 → 저장 행 (ds 를 UTC 로 보고 KST 날짜/시간으로, 구간 밖 제외, yhat 은 0 이상 소수 둘째 자리)
+def forecast_rows(name: str, place_type: str, forecast_df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    ds = forecast_df['ds'].dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
+    dates = ds.dt.date
     start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
     end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
-    now_kst = datetime.now(pytz.timezone('Asia/Seoul'))
-
-    insert_query = """
-        INSERT INTO forecast (name, type, forecast_date, forecast_hour, yhat, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            yhat = VALUES(yhat),
-            updated_at = VALUES(updated_at)
-    """
-
-    insert_data = [
-        (
-            name, place_type, row['date'], row['hour'],
-            max(0, round(row['yhat'], 2)), now_kst, now_kst
-        )
-        for _, row in forecast_df.iterrows()
-        if start_dt <= row['date'] <= end_dt
-    ]
-
-    if insert_data:
-        cursor.executemany(insert_query, insert_data)
-        conn.commit()
-        print(f"[{place_type.upper()}] {name} → {len(insert_data)}건 저장 완료")
-
-    cursor.close()
-    conn.close()
+    keep = ((dates >= start_dt) & (dates <= end_dt)).to_numpy(dtype=bool)
+    return pd.DataFrame({
+        'name': name,
+        'type': place_type,
+        'forecast_date': dates.to_numpy()[keep],
+        'forecast_hour': ds.dt.hour.to_numpy()[keep],
+        'yhat': np.maximum(forecast_df['yhat'].to_numpy(dtype=float)[keep].round(2), 0),
+    })
+
+# 예측 행의 저장 내용
+def forecast_write(rows: pd.DataFrame) -> delta_writer.DeltaWrite:
+    return delta_writer.DeltaWrite('forecast', rows, FORECAST_KEYS, ['yhat'], 'forecast_date',
+                                   FORECAST_UPSERT_UPDATE, label='forecast')
+
+# 예측 행에서 바로 혼잡도 계산 후 forecast, congestion 을 한 트랜잭션으로 저장 (바뀐 행만)
+# 저장된 예측을 다시 읽지 않음, {'forecast': {...}, 'congestion': {...}} 반환
+# 시간 단위가 아닌 이력(이전 .pkl 모델)은 한 시간에 여러 행이 나오므로 upsert 결과처럼 키별 마지막 행만 남겨
+# 두 테이블 모두 같은 행으로 계산/저장 (체류 시간 창이 행이 아니라 시간 기준이 되도록)
+def save_forecasts_and_congestion(rows: pd.DataFrame, start_date: str, end_date: str) -> dict:
+    rows = rows.drop_duplicates(subset=FORECAST_KEYS, keep='last').reset_index(drop=True)
+    for (name, place_type), count in rows.groupby(['name', 'type'], sort=False).size().items():
+        print(f"[{place_type.upper()}] {name} → {count}건 예측")
+    congestion = calculate_congestion.compute_congestion(calculate_congestion.matching_type(rows))
+    calculate_congestion.print_congestion_counts(congestion)
+    return delta_writer.delta_upsert_many(
+        [forecast_write(rows), calculate_congestion.congestion_write(congestion)], start_date, end_date
+    )
 
 # 실행
 def main():
@@ -76,29 +122,34 @@ def main():
     start_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
     end_date = (today + timedelta(days=7)).strftime('%Y-%m-%d')
 
+    # 모델 불러오기 (장소 이름 → 모델, 장소 종류)
+    models, place_types = {}, {}
+
     # 공원 처리
     for park in park_list:
-        model_path = os.path.join(model_dir, f"{park.replace(' ', '_')}.pkl")
-        if not os.path.exists(model_path):
+        model = load_model(os.path.join(model_dir, park.replace(' ', '_')))
+        if model is None:
             print(f"[{park}] 모델 없음")
             continue
-        model = load_model(model_path)
-        future = model.make_future_dataframe(periods=9*24, freq='h')
-        forecast = model.predict(future)
-        forecast['yhat'] = forecast['yhat'].clip(lower=0)
-        save_forecast_to_db(park, 'park', forecast, start_date, end_date)
+        models[park], place_types[park] = model, 'park'
 
     # 거리 처리
     for serial_no, street_name in main_street_map.items():
-        model_path = os.path.join('models_mainstreet', f"{street_name}.pkl")
-        if not os.path.exists(model_path):
+        model = load_model(os.path.join('models_mainstreet', street_name))
+        if model is None:
             print(f"[{serial_no}] 모델 없음")
             continue
-        model = load_model(model_path)
-        future = model.make_future_dataframe(periods=9*24, freq='H')
-        forecast = model.predict(future)
-        forecast['yhat'] = forecast['yhat'].clip(lower=0)
-        save_forecast_to_db(street_name, 'mainstreet', forecast, start_date, end_date)
+        models[street_name], place_types[street_name] = model, 'mainstreet'
+
+    # 전체 장소 예측 → 혼잡도 계산 → 예측/혼잡도 한 번에 저장
+    rows = [
+        forecast_rows(name, place_types[name], result, start_date, end_date)
+        for name, result in forecast_all(models, start_date, end_date).items()
+    ]
+    if rows:
+        db.ensure_indexes(calculate_congestion.FORECAST_INDEXES)
+        save_forecasts_and_congestion(pd.concat(rows, ignore_index=True), start_date, end_date)
 
 if __name__ == '__main__':
     main()
+    db.report()
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+# 공원 / 메인거리 공통 전처리 (벡터화)
+
+DISTRICT_MAP = {
+    "Jongno-gu": "종로구", "Jung-gu": "중구", "Yongsan-gu": "용산구", "Seongdong-gu": "성동구",
+    "Gwangjin-gu": "광진구", "Dongdaemun-gu": "동대문구", "Jungnang-gu": "중랑구", "Seongbuk-gu": "성북구",
+    "Gangbuk-gu": "강북구", "Dobong-gu": "도봉구", "Nowon-gu": "노원구", "Eunpyeong-gu": "은평구",
+    "Seodaemun-gu": "서대문구", "Mapo-gu": "마포구", "Yangcheon-gu": "양천구", "Gangseo-gu": "강서구",
+    "Guro-gu": "구로구", "Geumcheon-gu": "금천구", "Yeongdeungpo-gu": "영등포구", "Dongjak-gu": "동작구",
+    "Gwanak-gu": "관악구", "Seocho-gu": "서초구", "Gangnam-gu": "강남구", "Songpa-gu": "송파구", "Gangdong-gu": "강동구"
+}
+
+PARK_NAME_MAP = {
+    ('성동구', 'Seongsu1ga1(il)-dong'): '서울숲공원',
+    ('성동구', 'Seongsu1ga1-dong'): '서울숲공원',
+    ('서대문구', 'Cheonyeon-dong'): '서대문독립공원',
+    ('강북구', 'Beon3-dong'): '북서울꿈의숲',
+    ('강북구', 'Beon3(sam)-dong'): '북서울꿈의숲',
+    # ('송파구', 'Jamsil6(yuk)-dong'): '송파나루공원',
+    # ('송파구', 'Jamsil6-dong'): '송파나루공원',
+    ('은평구', 'Nokbeon-dong'): '은평평화공원',
+    ('강동구', 'Amsa3(sam)-dong'): '암사생태공원',
+    ('강동구', 'Amsa3-dong'): '암사생태공원'
+}
+DEFAULT_PARK_NAME = '기타공원'
+
+RENAME_COLUMNS = {
+    'MODEL_NM': '모델명',
+    'SERIAL_NO': '시리얼번호',
+    'SENSING_TIME': '측정시간',
+    'REGION': '지역',
+    'AUTONOMOUS_DISTRICT': '자치구',
+    'ADMINISTRATIVE_DISTRICT': '행정동',
+    'VISITOR_COUNT': '방문자수',
+    'REG_DTTM': '등록일'
+}
+
+PARK_COLUMNS = ['측정시간', '행정동', '방문자수', '구', '공원명']
+MAINSTREET_COLUMNS = ['시리얼번호', '측정시간', '행정동', '방문자수', '구']
+
+
+# (구, 행정동) → 공원명 조회 테이블
+def park_name_table(park_name_map: dict = PARK_NAME_MAP) -> pd.DataFrame:
+    return pd.DataFrame(
+        [(gu, dong, name) for (gu, dong), name in park_name_map.items()],
+        columns=['구', '행정동', '공원명']
+    )
+
+
+# 고유값에만 fn 을 적용해 전체 열로 펼침 (반복이 많은 측정시간/시리얼 등)
+def _map_unique(series: pd.Series, fn) -> pd.Series:
+    codes, uniques = pd.factorize(series)
+    return pd.Series(fn(pd.Series(uniques)).to_numpy()[codes], index=series.index)
+
+
+# 고유값에만 fn 을 적용한 범주형 열
+def _map_categorical(series: pd.Series, fn) -> pd.Categorical:
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Index(fn(pd.Series(uniques)))
+    categories = mapped.dropna().unique()
+    mapped_codes = np.append(categories.get_indexer(mapped), -1)
+    return pd.Categorical.from_codes(mapped_codes[codes], categories=categories)
+
+
+# 이름 변경 + 측정시간 형식 통일 + 구 매핑 + 범주형 변환
+def _common(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename(columns=RENAME_COLUMNS).drop(columns='등록일')
+    df['측정시간'] = _map_unique(df['측정시간'], lambda s: s.str.replace('_', ' ', regex=False)).astype(df['측정시간'].dtype)
+    df['구'] = _map_categorical(df['자치구'], lambda s: s.map(DISTRICT_MAP))
+    df['자치구'] = df['자치구'].astype('category')
+    df['행정동'] = df['행정동'].astype('category')
+    if '지역' in df:
+        df['지역'] = df['지역'].astype('category')
+    df['방문자수'] = pd.to_numeric(df['방문자수'], downcast='integer')
+    return df
+
+
+# 공원 데이터 전처리
+def preprocess_park_data(df_park: pd.DataFrame, park_name_map: dict = PARK_NAME_MAP) -> pd.DataFrame:
+    df_park = _common(df_park)
+
+    # (구, 행정동) 키 테이블과 해시 조인, 없는 조합은 기타공원
+    table = park_name_table(park_name_map)
+    keys = pd.MultiIndex.from_frame(table[['구', '행정동']])
+    positions = keys.get_indexer(pd.MultiIndex.from_arrays([df_park['구'], df_park['행정동']]))
+    names = np.append(table['공원명'].to_numpy(dtype=object), DEFAULT_PARK_NAME)
+    categories = pd.unique(names)
+    df_park['공원명'] = pd.Categorical.from_codes(
+        pd.Index(categories).get_indexer(names)[positions], categories=categories
+    )
+
+    df_park = df_park[PARK_COLUMNS]
+    df_park = df_park.sort_values('측정시간').reset_index(drop=True)
+    return df_park
+
+
+# 메인거리 데이터 전처리 (keep_region=True 면 지역 컬럼 유지)
+def preprocess_mainstreet_data(df_main: pd.DataFrame, keep_region: bool = False) -> pd.DataFrame:
+    df_main = df_main[df_main['SERIAL_NO'].notna()]
+    df_main = _common(df_main)
+    df_main['시리얼번호'] = _map_categorical(df_main['시리얼번호'], lambda s: s.astype(int).astype(str))
+
+    columns = MAINSTREET_COLUMNS[:2] + ['지역'] + MAINSTREET_COLUMNS[2:] if keep_region else MAINSTREET_COLUMNS
+    df_main = df_main[columns]
+    df_main = df_main.sort_values('측정시간').reset_index(drop=True)
+    return df_main
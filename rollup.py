@@ -0,0 +1,265 @@
+import argparse
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+import bulk_loader
+import db
+
+# 장소별 시간 단위 방문자 집계 (학습 입력)
+# visitor_hourly: (place_type, place, hour_start) → 합계/평균/행 수, 행이 없는 시간은 is_gap=1
+# - 원본 행이 들어온 장소·시간 구간만 원본에서 다시 집계해 upsert (중복 행은 DISTINCT 로 제외)
+# - 구간은 장소별 마지막 집계 시간 다음부터 이어서 잡아 빠진 시간도 gap 으로 채움
+ROLLUP_TABLE = 'visitor_hourly'
+
+# place_type → (원본 테이블, 장소 컬럼, 센서 구분 컬럼)
+SOURCES = {
+    'park': ('park', 'park_name', 'dong'),
+    'main_street': ('main_street', 'serial_no', 'dong'),
+}
+
+CREATE_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+        place_type VARCHAR(20) NOT NULL,
+        place VARCHAR(50) NOT NULL,
+        hour_start DATETIME NOT NULL,
+        visitor_sum INT NOT NULL,
+        visitor_mean DOUBLE NULL,
+        sample_count INT NOT NULL,
+        is_gap TINYINT(1) NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (place_type, place, hour_start)
+    )
+"""
+
+UPSERT_UPDATE = (
+    "visitor_sum = VALUES(visitor_sum), visitor_mean = VALUES(visitor_mean), "
+    "sample_count = VALUES(sample_count), is_gap = VALUES(is_gap), updated_at = VALUES(updated_at)"
+)
+
+
+# 원본 구간 집계에 쓰는 (장소, 측정시간) 복합 인덱스
+SOURCE_INDEXES = {
+    'park': ('idx_park_name_time', ['park_name', 'measuring_time']),
+    'main_street': ('idx_serial_time', ['serial_no', 'measuring_time']),
+}
+
+
+# 집계 테이블과 원본 인덱스 생성 (이미 있으면 그대로)
+def ensure_table() -> None:
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(CREATE_TABLE)
+        cursor.close()
+    finally:
+        conn.close()
+    db.ensure_indexes(SOURCE_INDEXES)
+
+
+# 장소별 마지막 집계 시간
+def last_hours(place_type: str) -> dict:
+    df = db.read_frame(
+        f"SELECT place, MAX(hour_start) AS last_hour FROM {ROLLUP_TABLE} WHERE place_type = %s GROUP BY place",
+        [place_type]
+    )
+    return {str(place): pd.Timestamp(ts) for place, ts in zip(df['place'], df['last_hour'])}
+
+
+# 원본에서 [start, end) 구간을 시간 단위로 집계하고 빈 시간은 gap 으로 채움
+# 원본은 서버측 커서로 나눠 받아 시간별 합계/행 수만 누적 (긴 구간 재집계도 원본 전체를 올리지 않음)
+def aggregate(place_type: str, place: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    table, name_col, sensor_col = SOURCES[place_type]
+    partials = []
+    for raw in db.stream_frames(
+        f"""
+        SELECT DISTINCT {sensor_col}, measuring_time, visitor_count
+        FROM {table}
+        WHERE {name_col} = %s AND measuring_time >= %s AND measuring_time < %s
+        """,
+        [place, start.to_pydatetime(), end.to_pydatetime()]
+    ):
+        hour_start = pd.to_datetime(raw['measuring_time']).dt.floor('h')
+        partials.append(raw['visitor_count'].astype('int64').groupby(hour_start).agg(['sum', 'count']))
+    hours = pd.date_range(start, end, freq='h', inclusive='left')
+    grouped = pd.concat(partials).groupby(level=0).sum().reindex(hours)
+
+    out = pd.DataFrame({
+        'place_type': place_type,
+        'place': place,
+        'hour_start': hours,
+        'visitor_sum': grouped['sum'].fillna(0).astype('int64').to_numpy(),
+        'sample_count': grouped['count'].fillna(0).astype('int64').to_numpy(),
+    })
+    # 빈 시간의 평균은 NaN 이 아닌 None 으로 둬야 NULL 로 저장됨 (pymysql 은 NaN 을 거부)
+    mean = out['visitor_sum'] / out['sample_count']
+    out['visitor_mean'] = mean.astype(object).where(out['sample_count'] > 0, None)
+    out['is_gap'] = (out['sample_count'] == 0).astype('int8')
+    return out
+
+
+# {장소: (첫 시간, 마지막 시간)} 구간을 다시 집계해 upsert, 기록한 행 수 반환
+def refresh(place_type: str, ranges: dict) -> int:
+    if not ranges:
+        return 0
+    ensure_table()
+    previous = last_hours(place_type)
+    frames = []
+    for place, (first_hour, last_hour) in ranges.items():
+        start = first_hour
+        if place in previous and previous[place] + pd.Timedelta(hours=1) < start:
+            start = previous[place] + pd.Timedelta(hours=1)
+        frames.append(aggregate(place_type, place, start, last_hour + pd.Timedelta(hours=1)))
+    df = pd.concat(frames, ignore_index=True)
+
+    kst_now = datetime.now(pytz.timezone('Asia/Seoul'))
+    conn = db.get_connection()
+    try:
+        bulk_loader.bulk_insert(
+            conn, ROLLUP_TABLE, df,
+            {col: col for col in ['place_type', 'place', 'hour_start', 'visitor_sum', 'visitor_mean', 'sample_count', 'is_gap']},
+            datetime_columns=('hour_start',), constants={'updated_at': kst_now},
+            on_duplicate=UPSERT_UPDATE, method='insert', label=f"{ROLLUP_TABLE} {place_type}"
+        )
+    finally:
+        conn.close()
+    print(f"[ROLLUP] {place_type} {len(ranges)}곳 {len(df)}시간 갱신 (gap {int(df['is_gap'].sum())})")
+    return len(df)
+
+
+# 방금 저장한 원본 행(장소, 측정시간)이 걸친 시간 구간만 갱신
+def update_from_frame(place_type: str, places: pd.Series, times: pd.Series) -> int:
+    if places.empty:
+        return 0
+    hours = pd.to_datetime(times).dt.floor('h')
+    bounds = hours.groupby(places.astype(str).to_numpy()).agg(['min', 'max'])
+    ranges = {place: (row['min'], row['max']) for place, row in bounds.iterrows()}
+    return refresh(place_type, ranges)
+
+
+# 학습용: since 이후 & after 이후의 gap 아닌 시간별 평균 (ds, y)
+def load_hourly(place_type: str, place: str, after: pd.Timestamp, since: pd.Timestamp) -> pd.DataFrame:
+    df = db.read_frame(
+        f"""
+        SELECT hour_start AS ds, visitor_mean AS y
+        FROM {ROLLUP_TABLE}
+        WHERE place_type = %s AND place = %s AND hour_start > %s AND hour_start >= %s AND is_gap = 0
+        ORDER BY hour_start
+        """,
+        [place_type, place, after.to_pydatetime(), since.to_pydatetime()]
+    )
+    df['ds'] = pd.to_datetime(df['ds'])
+    df['y'] = df['y'].astype(float)
+    return df
+
+
+# 장소 하나의 [first_hour, last_hour] 를 days 일씩 나눠 다시 집계, 기록한 행 수 반환
+def refresh_span(place_type: str, place: str, first_hour: pd.Timestamp, last_hour: pd.Timestamp, days: int = 30) -> int:
+    written = 0
+    start = first_hour
+    while start <= last_hour:
+        end = min(start + pd.Timedelta(days=days) - pd.Timedelta(hours=1), last_hour)
+        written += refresh(place_type, {place: (start, end)})
+        start = end + pd.Timedelta(hours=1)
+    return written
+
+
+# 원본 전체 기간으로 다시 집계 (장소별 days 일씩 나눠 처리)
+def rebuild(place_type: str, days: int = 30) -> int:
+    table, name_col, _ = SOURCES[place_type]
+    bounds = db.read_frame(
+        f"SELECT {name_col} AS place, MIN(measuring_time) AS first, MAX(measuring_time) AS last FROM {table} GROUP BY {name_col}"
+    )
+    written = 0
+    for place, first, last in zip(bounds['place'], bounds['first'], bounds['last']):
+        if pd.isna(place):
+            continue
+        written += refresh_span(place_type, str(place), pd.Timestamp(first).floor('h'), pd.Timestamp(last).floor('h'), days)
+    return written
+
+
+# 장소별 (첫 시간, 마지막 시간) (since 이후만)
+def _bounds(query: str, params: list) -> dict:
+    df = db.read_frame(query, params)
+    return {
+        str(place): (pd.Timestamp(first).floor('h'), pd.Timestamp(last).floor('h'))
+        for place, first, last in zip(df['place'], df['first'], df['last'])
+        if not pd.isna(place)
+    }
+
+
+# since 이후 원본이 있는데 집계가 덮지 못한 앞/뒤 구간을 원본에서 채움
+# (첫 배포 직후 집계가 비어 있을 때, 집계를 거치지 않고 원본에 들어간 행), {장소: 채운 시간 수} 반환
+def ensure_coverage(place_type: str, places: list, since: pd.Timestamp) -> dict:
+    if not places:
+        return {}
+    ensure_table()
+    table, name_col, _ = SOURCES[place_type]
+    since_hour = since.floor('h').to_pydatetime()
+    placeholders = ", ".join(["%s"] * len(places))
+    raw = _bounds(
+        f"""
+        SELECT {name_col} AS place, MIN(measuring_time) AS first, MAX(measuring_time) AS last
+        FROM {table}
+        WHERE {name_col} IN ({placeholders}) AND measuring_time >= %s
+        GROUP BY {name_col}
+        """,
+        list(places) + [since_hour]
+    )
+    done = _bounds(
+        f"""
+        SELECT place, MIN(hour_start) AS first, MAX(hour_start) AS last
+        FROM {ROLLUP_TABLE}
+        WHERE place_type = %s AND place IN ({placeholders}) AND hour_start >= %s
+        GROUP BY place
+        """,
+        [place_type] + list(places) + [since_hour]
+    )
+
+    filled = {}
+    for place, (first, last) in raw.items():
+        covered_first, covered_last = done.get(place, (None, None))
+        if covered_first is None:
+            spans = [(first, last)]
+        else:
+            spans = [(first, covered_first - pd.Timedelta(hours=1)), (covered_last + pd.Timedelta(hours=1), last)]
+        written = sum(refresh_span(place_type, place, start, end) for start, end in spans if start <= end)
+        if written:
+            filled[place] = written
+            print(f"[ROLLUP] {place_type} {place}: 집계가 없던 {written}시간을 원본에서 채움")
+    return filled
+
+
+# 장소별 updated_after 이후 다시 집계된 가장 이른 시간 (늦게 채워진 과거 구간 확인용)
+def earliest_updated(place_type: str, places: list, updated_after: datetime) -> dict:
+    if not places:
+        return {}
+    placeholders = ", ".join(["%s"] * len(places))
+    df = db.read_frame(
+        f"""
+        SELECT place, MIN(hour_start) AS first_hour
+        FROM {ROLLUP_TABLE}
+        WHERE place_type = %s AND place IN ({placeholders}) AND updated_at >= %s
+        GROUP BY place
+        """,
+        [place_type] + list(places) + [updated_after]
+    )
+    return {str(place): pd.Timestamp(first) for place, first in zip(df['place'], df['first_hour'])}
+
+
+# updated_at 과 같은 기준의 현재 시각 (KST, tz 없음)
+def now_kst() -> datetime:
+    return datetime.now(pytz.timezone('Asia/Seoul')).replace(tzinfo=None)
+
+
+# 실행
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="시간 단위 방문자 집계 테이블 재생성")
+    parser.add_argument('--only', choices=list(SOURCES), help="한쪽만 재생성")
+    args = parser.parse_args()
+
+    for place_type in SOURCES:
+        if args.only in (None, place_type):
+            rebuild(place_type)
+    db.report()
@@ -0,0 +1,370 @@
+import html
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import page_cache
+from page_cache import CacheMiss, PageCache
+
+# S-DoT 유동인구 API (서울 열린데이터광장)
+BASE_URL = "http://openapi.seoul.go.kr:8088"
+DATASET = "IotVdata018"
+MAX_WINDOW = 1000      # API 1회 최대 요청 건수
+MAX_ROWS = 99900       # 기존 수집 상한 (100건 × 999페이지)
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 30
+
+COLUMNS = [
+    "MODEL_NM", "SERIAL_NO", "SENSING_TIME", "REGION",
+    "AUTONOMOUS_DISTRICT", "ADMINISTRATIVE_DISTRICT", "VISITOR_COUNT", "REG_DTTM"
+]
+
+
+# 커넥션 풀을 공유하는 HTTP 세션
+def make_session(workers: int = DEFAULT_WORKERS) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=workers,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+STRING_COLUMNS = [col for col in COLUMNS if col != "VISITOR_COUNT"]
+FINDTEXT_COLUMNS = ("MODEL_NM", "SERIAL_NO")   # 빈 태그는 None 대신 ""
+COLUMN_INDEX = {col.encode(): i for i, col in enumerate(COLUMNS)}
+TREE_COLUMN_INDEX = {col: i for i, col in enumerate(COLUMNS)}
+VISITOR_INDEX = COLUMNS.index("VISITOR_COUNT")
+# 빠른 경로 토큰: (태그, "/" 면 빈 태그, 값) — 속성/주석/CDATA 없는 평평한 row 목록 전용, 닫는 태그는 건너뜀
+ROW_TOKEN = re.compile(rb"<([A-Za-z_][A-Za-z0-9_]*)(/?)>([^<]*)")
+
+
+# 원본 값 → 문자열 (빠른 경로는 바이트, ElementTree 경로는 이미 변환된 문자열)
+# 빈 값은 FINDTEXT 컬럼만 "", 바이트의 엔티티는 있을 때만 변환
+def _decode(col: str, value) -> Optional[str]:
+    if not value:
+        return "" if value is not None and col in FINDTEXT_COLUMNS else None
+    if isinstance(value, str):
+        return value
+    text = value.decode("utf-8")
+    return html.unescape(text) if "&" in text else text
+
+
+# 빠른 경로: 정규식 토큰으로 한 번 훑어 행 목록 (값은 원본 바이트)
+# 페이지의 모든 '<' 가 여는/닫는/빈 태그 또는 XML 선언으로 설명되지 않으면
+# (속성, 주석, CDATA, '<row >' 등) None 을 반환해 ElementTree 경로로 넘김
+def _scan_rows(content: bytes) -> Optional[list]:
+    header = content[:100].lower()
+    if b"encoding=" in header and b"utf-8" not in header:
+        return None
+    tokens = ROW_TOKEN.findall(content)
+    if content.count(b"<") != len(tokens) + content.count(b"</") + content.count(b"<?"):
+        return None
+    rows = []
+    current = None
+    index = COLUMN_INDEX
+    for tag, empty, value in tokens:
+        if tag == b"row":
+            current = [None] * len(COLUMNS)
+            rows.append(current)
+        elif current is not None:
+            i = index.get(tag)
+            if i is not None:
+                current[i] = b"" if empty else value
+    return rows
+
+
+# ElementTree 경로: iterparse 로 스트리밍하며 행 목록 (값은 문자열, 처리한 row 는 바로 비움)
+def _parse_rows(content: bytes) -> list:
+    rows = []
+    current = None
+    for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+        if elem.tag == "row":
+            if event == "start":
+                current = [None] * len(COLUMNS)
+                rows.append(current)
+            else:
+                current = None
+                elem.clear()
+        elif event == "end" and current is not None:
+            i = TREE_COLUMN_INDEX.get(elem.tag)
+            if i is not None:
+                current[i] = elem.text if elem.text is not None else ""
+    return rows
+
+
+# 열 단위 파싱 버퍼: 방문자수는 int64 array, 문자열은 사전 인코딩(코드 + 고유값)
+# 일반 피드 페이지는 정규식 토큰으로 한 번 훑고 사전은 원본 바이트 기준 (문자열 변환은 고유값마다 한 번),
+# 그 형식을 벗어난 페이지는 iterparse 로 같은 버퍼에 채움 (scan=False 면 항상 iterparse)
+# 페이지 한 장 분량의 행 목록만 잠깐 만들고 버리므로 행 dict 가 쌓이지 않음
+class ColumnBuffer:
+    def __init__(self, scan: bool = True):
+        self.scan = scan
+        self.dictionaries = {col: {} for col in STRING_COLUMNS}
+        self.codes = {col: array("i") for col in STRING_COLUMNS}
+        self.visitor_count = array("q")
+
+    def __len__(self) -> int:
+        return len(self.visitor_count)
+
+    # XML 페이지 한 장을 파싱해 버퍼에 추가, 추가된 행 수 반환
+    def add_page(self, content: bytes) -> int:
+        rows = _scan_rows(content) if self.scan else None
+        if rows is None:
+            rows = _parse_rows(content)
+
+        for col in STRING_COLUMNS:
+            i = COLUMN_INDEX[col.encode()]
+            dictionary = self.dictionaries[col]
+            self.codes[col].extend([dictionary.setdefault(row[i], len(dictionary)) for row in rows])
+        self.visitor_count.extend([int(row[VISITOR_INDEX]) for row in rows])
+        return len(rows)
+
+    # 마지막으로 추가된 행의 값
+    def last(self, col: str):
+        return _decode(col, list(self.dictionaries[col])[self.codes[col][-1]])
+
+    def categories(self, col: str) -> np.ndarray:
+        values = np.empty(len(self.dictionaries[col]), dtype=object)
+        values[:] = [_decode(col, value) for value in self.dictionaries[col]]
+        return values
+
+    # DataFrame 변환, 날짜 구간(또는 after 이후)이 주어지면 SENSING_TIME 고유값 단위로 필터
+    def to_frame(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 after: Optional[str] = None) -> pd.DataFrame:
+        mask = None
+        if start_date or end_date or after:
+            times = self.categories("SENSING_TIME")
+            days = np.array([t[:10] for t in times], dtype=object)
+            keep = np.ones(len(days), dtype=bool)
+            if start_date:
+                keep &= days >= start_date
+            if end_date:
+                keep &= days <= end_date
+            if after:
+                keep &= times > after
+            mask = keep[np.frombuffer(self.codes["SENSING_TIME"], dtype=np.int32)]
+
+        data = {}
+        for col in COLUMNS:
+            if col == "VISITOR_COUNT":
+                values = np.frombuffer(self.visitor_count, dtype=np.int64)
+            else:
+                values = self.categories(col)[np.frombuffer(self.codes[col], dtype=np.int32)]
+            data[col] = values[mask] if mask is not None else values
+        return pd.DataFrame(data, columns=COLUMNS)
+
+
+class SdotClient:
+    def __init__(self, api_key: str, base_url: str = BASE_URL, workers: int = DEFAULT_WORKERS,
+                 window: int = MAX_WINDOW, session: Optional[requests.Session] = None,
+                 cache: Union[PageCache, bool] = True, replay: Optional[bool] = None,
+                 replay_date: Optional[str] = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.window = min(window, MAX_WINDOW)
+        self.session = session or make_session(workers)
+
+        # cache=True 면 환경변수 기본 캐시에 응답을 새 스냅샷으로 기록 (live 는 캐시를 읽지 않음)
+        # replay 면 네트워크 없이 기록된 스냅샷 하나만 사용 (replay_date / SDOT_REPLAY_DATE 로 시작하는 최신 스냅샷)
+        self.cache = page_cache.default_cache() if cache is True else (cache or None)
+        self.replay = page_cache.replay_enabled() if replay is None else replay
+        if self.replay and self.cache is None:
+            self.cache = page_cache.PageCache()
+        if self.replay:
+            self.snapshot = self.cache.latest_snapshot(DATASET, replay_date or os.getenv("SDOT_REPLAY_DATE"))
+        else:
+            self.snapshot = page_cache.snapshot_id() if self.cache is not None else None
+
+    def page_url(self, start: int, end: int) -> str:
+        return f"{self.base_url}/{self.api_key}/xml/{DATASET}/{start}/{end}"
+
+    # 단일 구간 요청 (start~end, 1부터 시작)
+    def fetch_page(self, start: int, end: int) -> bytes:
+        if self.replay:
+            content = self.cache.get(DATASET, start, end, self.snapshot) if self.snapshot else None
+            if content is None:
+                raise CacheMiss(f"캐시에 없는 구간: {DATASET} {start}~{end} ({self.snapshot})")
+            return content
+
+        response = self.session.get(self.page_url(start, end), timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        content = response.content
+        # 정상 응답(INFO-000 / INFO-200)만 캐시
+        if self.cache is not None and b"<CODE>INFO-" in content:
+            self.cache.put(DATASET, start, end, content, self.snapshot)
+        return content
+
+    # 구간을 최대 window 크기로 나누어 병렬 요청, 요청 순서대로 반환
+    def iter_pages(self, start_row: int = 1, end_row: int = MAX_ROWS) -> Iterator[Tuple[int, int, bytes]]:
+        windows = [(s, min(s + self.window - 1, end_row)) for s in range(start_row, end_row + 1, self.window)]
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        try:
+            for start, end in windows:
+                pending.append((start, end, pool.submit(self.fetch_page, start, end)))
+                if len(pending) >= self.workers:
+                    start, end, future = pending.popleft()
+                    yield start, end, future.result()
+            while pending:
+                start, end, future = pending.popleft()
+                yield start, end, future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # 단일 행 조회 → SENSING_TIME (피드 범위 밖이면 None)
+    def probe(self, row: int) -> Optional[str]:
+        root = ET.fromstring(self.fetch_page(row, row))
+        return root.findtext("row/SENSING_TIME")
+
+    # 최신순 피드에서 [start_date, end_date] 날짜가 들어있는 행 범위 탐색
+    # window 단위로 galloping 후 이분 탐색하므로 요청 수는 log(오프셋) 수준
+    def locate_rows(self, start_date: str, end_date: str) -> Optional[Tuple[int, int]]:
+        return self._locate(
+            is_older=lambda t: t is None or t[:10] < start_date,
+            reached_range=lambda t: t is None or t[:10] <= end_date
+        )
+
+    # since(SENSING_TIME 형식) 보다 최신인 행 범위 (1행부터)
+    def locate_since(self, since: str) -> Optional[Tuple[int, int]]:
+        return self._locate(
+            is_older=lambda t: t is None or t <= since,
+            reached_range=lambda t: True
+        )
+
+    # is_older: 구간보다 오래된 행, reached_range: 구간 또는 그보다 오래된 행 (None = 피드 끝)
+    def _locate(self, is_older, reached_range) -> Optional[Tuple[int, int]]:
+        times = {}
+
+        def time_at(row: int) -> Optional[str]:
+            if row not in times:
+                times[row] = self.probe(row)
+            return times[row]
+
+        def bisect(pred, lo: int, hi: int) -> Tuple[int, int]:
+            while hi - lo > self.window:
+                mid = (lo + hi) // 2
+                if pred(time_at(mid)):
+                    hi = mid
+                else:
+                    lo = mid
+            return lo, hi
+
+        # 1) 구간 이전 행이 나올 때까지 보폭을 두 배씩 늘려 전진
+        probed = [1]
+        step = self.window
+        while not is_older(time_at(probed[-1])):
+            probed.append(probed[-1] + step)
+            step *= 2
+        if len(probed) == 1:
+            return None
+
+        # 2) 구간 시작(첫 행)과 끝(마지막 행)을 window 정밀도로 좁힘
+        newer = [row for row in probed if not reached_range(time_at(row))]
+        if newer:
+            lo_start, _ = bisect(reached_range, newer[-1], probed[len(newer)])
+        else:
+            lo_start = 0
+        _, hi_end = bisect(is_older, probed[-2], probed[-1])
+
+        first_row, last_row = lo_start + 1, hi_end - 1
+        return (first_row, last_row) if first_row <= last_row else None
+
+    # span 의 페이지를 parse 에 넘겨 결과를 차례로 반환 (parse(content) → (페이지 마지막 행 SENSING_TIME 또는 None, 결과))
+    # 탐색 뒤 새 행이 들어오면 최신순 피드가 뒤로 밀려 구간 끝 행이 span 밖으로 나가므로,
+    # span 을 다 읽고도 마지막 행이 구간보다 오래되지 않았으면 다음 window 를 이어서 읽음
+    def iter_span(self, span: Tuple[int, int], is_older, parse) -> Iterator:
+        end_row = span[1]
+        for _, end_row, content in self.iter_pages(*span):
+            oldest, result = parse(content)
+            yield result
+            if oldest is None:
+                return
+        while not is_older(oldest):
+            start_row, end_row = end_row + 1, end_row + self.window
+            oldest, result = parse(self.fetch_page(start_row, end_row))
+            yield result
+
+    # 페이지를 buffer 에 추가하는 parse
+    @staticmethod
+    def _into(buffer: ColumnBuffer):
+        return lambda content: (buffer.last("SENSING_TIME") if buffer.add_page(content) else None, None)
+
+    # [start_date, end_date] (YYYY-MM-DD) 구간 수집, 피드 순서(최신순) 유지
+    def fetch_range_data(self, start_date: str, end_date: str) -> pd.DataFrame:
+        buffer = ColumnBuffer()
+        span = self.locate_rows(start_date, end_date)
+        if span:
+            for _ in self.iter_span(span, lambda t: t is None or t[:10] < start_date, self._into(buffer)):
+                pass
+        if self.cache is not None and not self.replay:
+            self.cache.evict()
+        return buffer.to_frame(start_date, end_date)
+
+    # since(SENSING_TIME 형식, 예: 2025-05-07_13:00:00) 이후 행만 수집
+    def fetch_since(self, since: str) -> pd.DataFrame:
+        buffer = ColumnBuffer()
+        span = self.locate_since(since)
+        if span:
+            for _ in self.iter_span(span, lambda t: t is None or t <= since, self._into(buffer)):
+                pass
+        if self.cache is not None and not self.replay:
+            self.cache.evict()
+        return buffer.to_frame(after=since)
+
+    # 구간을 한 번만 훑으면서 날짜가 끝날 때마다 (날짜, DataFrame) 반환 (최신 날짜부터)
+    def iter_range_days(self, start_date: str, end_date: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+        span = self.locate_rows(start_date, end_date)
+        if not span:
+            return
+
+        def parse(content: bytes):
+            buffer = ColumnBuffer()
+            if not buffer.add_page(content):
+                return None, None
+            oldest = buffer.last("SENSING_TIME")
+            return oldest, (oldest[:10], buffer.to_frame(start_date, end_date))
+
+        pending = {}
+        for page in self.iter_span(span, lambda t: t is None or t[:10] < start_date, parse):
+            if page is None:
+                break
+            oldest_day, df_page = page
+            for day, df_day in df_page.groupby(df_page["SENSING_TIME"].str[:10], sort=False):
+                pending.setdefault(day, []).append(df_day)
+            # 피드는 최신순이므로 이 페이지의 마지막 날짜보다 최신인 날은 완료
+            for day in sorted(pending, reverse=True):
+                if day <= oldest_day:
+                    break
+                yield day, pd.concat(pending.pop(day), ignore_index=True)
+        for day in sorted(pending, reverse=True):
+            yield day, pd.concat(pending.pop(day), ignore_index=True)
+        if self.cache is not None and not self.replay:
+            self.cache.evict()
+
+    # target_date(YYYY-MM-DD) 하루치 수집
+    def fetch_date_data(self, target_date: str) -> pd.DataFrame:
+        return self.fetch_range_data(target_date, target_date)
+
+
+def fetch_date_data(api_key: str, target_date: str, **kwargs) -> pd.DataFrame:
+    return SdotClient(api_key, **kwargs).fetch_date_data(target_date)
+
+
+def fetch_since(api_key: str, since: str, **kwargs) -> pd.DataFrame:
+    return SdotClient(api_key, **kwargs).fetch_since(since)